@@ -1,4 +1,4 @@
-from collections import defaultdict
+from collections import defaultdict, deque
 import re
 
 class AHO_ATS:
@@ -154,13 +154,132 @@ class AHO_ATS:
                     result[word].append(i-len(word)+1)
         return result
 
+class AHO_ARRAY_ATS:
+    """
+    Aho-Corasick dengan tabel transisi dense (array) atas alfabet penuh.
+
+    - Setiap karakter yang muncul di keyword punya index sendiri (tidak ada
+      collision seperti char_to_index di AHO_ATS), semua karakter lain
+      dipetakan ke index 0 karena tidak mungkin jadi bagian dari match.
+    - Transisi sudah lengkap (DFA), jadi search cukup satu lookup per karakter
+      tanpa mengikuti failure link.
+    - Output tiap state disimpan sebagai list index keyword (sudah termasuk
+      output dari failure link), jadi tidak perlu loop semua keyword.
+    - Text tidak diubah (tidak buang tanda baca), hasil sama dengan KMP/BM.
+    """
+
+    def __init__(self, words):
+        # unique, non-empty, lowercase, urutan input dipertahankan
+        self.words = []
+        seen = set()
+        for word in words:
+            word = word.lower()
+            if word and word not in seen:
+                seen.add(word)
+                self.words.append(word)
+        self.lengths = [len(word) for word in self.words]
+
+        # Alfabet: index 0 untuk karakter di luar keyword
+        self.char_index = {}
+        for word in self.words:
+            for character in word:
+                if character not in self.char_index:
+                    self.char_index[character] = len(self.char_index) + 1
+        self.alphabet_size = len(self.char_index) + 1
+
+        self.states_count = self.build_matching()
+
+    def build_matching(self) -> int:
+        """Build trie, failure links, complete transition table and outputs"""
+        A = self.alphabet_size
+
+        # ========= 1. Trie =========
+        goto = [[-1] * A]
+        out = [[]]
+        for i, word in enumerate(self.words):
+            current_state = 0
+            for character in word:
+                ch = self.char_index[character]
+                if goto[current_state][ch] == -1:
+                    goto[current_state][ch] = len(goto)
+                    goto.append([-1] * A)
+                    out.append([])
+                current_state = goto[current_state][ch]
+            out[current_state].append(i)
+
+        states = len(goto)
+        fail = [0] * states
+
+        # ========= 2. Failure link + transisi lengkap (BFS) =========
+        queue = deque()
+        for ch in range(A):
+            next_state = goto[0][ch]
+            if next_state == -1:
+                goto[0][ch] = 0
+            else:
+                fail[next_state] = 0
+                queue.append(next_state)
+
+        while queue:
+            state = queue.popleft()
+            # output dari failure link ikut jadi output state ini
+            out[state] = out[state] + out[fail[state]]
+            for ch in range(A):
+                next_state = goto[state][ch]
+                if next_state == -1:
+                    # gada path -> ikut transisi failure state (sudah lengkap)
+                    goto[state][ch] = goto[fail[state]][ch]
+                else:
+                    fail[next_state] = goto[fail[state]][ch]
+                    queue.append(next_state)
+
+        # ========= 3. Flatten =========
+        # delta menyimpan offset baris (state * A) supaya search tidak perlu kali
+        self.delta = [next_state * A for row in goto for next_state in row]
+        self.out = [None] * (states * A)
+        for state in range(states):
+            if out[state]:
+                self.out[state * A] = tuple(out[state])
+        self.fail = fail
+
+        return states
+
+    def search_words(self, text):
+        """
+        Search for matching words in text
+
+        Returns:
+            defaultdict(list): word -> list of start indexes
+        """
+        result = defaultdict(list)
+        if not self.words:
+            return result
+
+        delta = self.delta
+        out = self.out
+        get_index = self.char_index.get
+        words = self.words
+        lengths = self.lengths
+
+        state = 0
+        for i, character in enumerate(text):
+            state = delta[state + get_index(character, 0)]
+            outputs = out[state]
+            if outputs is not None:
+                for j in outputs:
+                    result[words[j]].append(i - lengths[j] + 1)
+
+        return result
+
 # ============= Test =============
 if __name__ == "__main__":
     words = ["he", "she", "hers", "his"]
     text = "ahishers"
-    aho_chorasick = AHO_ATS(words)
-    result = aho_chorasick.search_words(text)
-    for word in result:
-        for i in result[word]:
-            print("Word", word, "appears from", i, "to", i+len(word)-1)
+    for aho_class in (AHO_ATS, AHO_ARRAY_ATS):
+        print(aho_class.__name__)
+        aho_chorasick = aho_class(words)
+        result = aho_chorasick.search_words(text)
+        for word in result:
+            for i in result[word]:
+                print("Word", word, "appears from", i, "to", i+len(word)-1)
 
@@ -12,21 +12,24 @@ class BM_ATS:
             bad_char[pattern[i]] = i
         return bad_char
 
-    def bm_search(self, text, pattern) -> list:
+    def bm_search(self, text, pattern, bad_char=None) -> list:
         """
         Implementasi Boyer-Moore menggunakan bad character heuristic.
-        Mengembalikan jumlah kemunculan pattern dalam text.
+        Mengembalikan list index kemunculan pattern dalam text.
+        bad_char bisa diberikan dari preprocess_bad_char supaya tidak
+        dihitung ulang untuk setiap text.
         """
         if not pattern:
-            return 0
+            return []
 
         n = len(text)
         m = len(pattern)
 
         if m == 0 or m > n:
-            return 0
+            return []
 
-        bad_char = self.preprocess_bad_char(pattern)
+        if bad_char is None:
+            bad_char = self.preprocess_bad_char(pattern)
 
         found_indexes = []
         i = 0
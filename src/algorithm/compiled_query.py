@@ -0,0 +1,65 @@
+from algorithm.kmp import KMP_ATS
+from algorithm.bm import BM_ATS
+from algorithm.aho import AHO_ARRAY_ATS
+
+
+class CompiledQuery:
+    """
+    Keyword query yang sudah di-preprocess sekali untuk satu algoritma,
+    lalu dipakai ulang untuk semua CV dalam satu pencarian.
+
+    - KMP: tabel LPS tiap keyword (compute_lps)
+    - BM: tabel bad character tiap keyword (preprocess_bad_char)
+    - Aho-Corasick: satu automaton (AHO_ARRAY_ATS) untuk semua keyword
+    """
+
+    def __init__(self, keywords, algorithm="KMP", kmp=None, bm=None):
+        self.keywords = list(keywords)
+        self.algorithm = algorithm
+        self.kmp = kmp if kmp is not None else KMP_ATS()
+        self.bm = bm if bm is not None else BM_ATS()
+
+        self.aho = None
+        self.tables = {}
+
+        if algorithm == "Aho-Corasick":
+            if self.keywords:
+                self.aho = AHO_ARRAY_ATS(self.keywords)
+        elif algorithm == "BM":
+            self.tables = {kw: self.bm.preprocess_bad_char(kw) for kw in self.keywords}
+        else:
+            self.tables = {kw: self.kmp.compute_lps(kw) for kw in self.keywords}
+
+    def matches(self, keywords, algorithm) -> bool:
+        """Check if this compiled query can be reused for keywords + algorithm"""
+        return self.algorithm == algorithm and self.keywords == list(keywords)
+
+    def search(self, text) -> dict:
+        """
+        Scan satu text dengan tabel yang sudah di-compile
+
+        Returns:
+            dict: keyword -> list of start indexes (hanya keyword yang ditemukan)
+        """
+        found = {}
+
+        if self.algorithm == "Aho-Corasick":
+            if self.aho is None:
+                return found
+            found_matches = self.aho.search_words(text)
+            for keyword in self.keywords:
+                indices = found_matches.get(keyword, [])
+                if indices:
+                    found[keyword] = indices
+            return found
+
+        for keyword in self.keywords:
+            if self.algorithm == "BM":
+                indexes = self.bm.bm_search(text, keyword, self.tables[keyword])
+            else:
+                indexes = self.kmp.kmp_search(text, keyword, self.tables[keyword])
+
+            if indexes:
+                found[keyword] = indexes
+
+        return found
@@ -1,10 +1,62 @@
 
 import re
+from collections import Counter, OrderedDict
+
+
+class SimilarityMemo:
+    '''
+    LRU memo (keyword, phrase, threshold) -> similarity, shared by every CV
+    scanned with the same FuzzyMatcher. Vocabulary repeats a lot across CVs,
+    so most levenshtein calls become a dict lookup.
+    '''
+
+    def __init__(self, max_size=200_000):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def peek(self, key):
+        """Lookup without touching LRU order or hit/miss counters"""
+        return self.entries.get(key)
+
+    def put(self, key, value):
+        self.entries[key] = value
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.entries),
+            "hit_rate": (self.hits / total) if total else 0.0,
+        }
+
 
 class FuzzyMatcher:
 
-    def __init__(self, threshold = 0.65):
+    def __init__(self, threshold = 0.65, memo_size = 200_000):
         self.threshold = threshold;
+        # memo_size = 0 -> no memoization
+        self.memo = SimilarityMemo(memo_size) if memo_size else None
 
     @staticmethod
     def get_ngrams(text, n):
@@ -48,24 +100,158 @@ class FuzzyMatcher:
         return cache[0][0]
 
 
-    def calculate_similarity(self, word1, word2):
+    def levenshtein_distance_bounded(self, word1, word2, max_distance):
+        '''
+        Levenshtein distance yang hanya peduli sampai max_distance.
+        - selisih panjang > max_distance -> langsung berhenti
+        - hanya diagonal band selebar max_distance, pakai dua baris
+        - berhenti begitu semua nilai di baris sudah > max_distance
+        Returns jarak asli jika <= max_distance, selain itu max_distance + 1
+        '''
+        len1, len2 = len(word1), len(word2)
+        too_far = max_distance + 1
+        if max_distance < 0:
+            return 0 if word1 == word2 else too_far
+        if abs(len1 - len2) > max_distance:
+            return too_far
+
+        previous = [j if j <= max_distance else too_far for j in range(len2 + 1)]
+        current = [too_far] * (len2 + 1)
+
+        for i in range(1, len1 + 1):
+            low = max(1, i - max_distance)
+            high = min(len2, i + max_distance)
+
+            if low == 1:
+                current[0] = i if i <= max_distance else too_far
+                row_min = current[0]
+            else:
+                current[low - 1] = too_far
+                row_min = too_far
+
+            char1 = word1[i - 1]
+            for j in range(low, high + 1):
+                value = previous[j - 1] if char1 == word2[j - 1] else previous[j - 1] + 1
+                if previous[j] + 1 < value:
+                    value = previous[j] + 1         # delete
+                if current[j - 1] + 1 < value:
+                    value = current[j - 1] + 1      # insert
+                if value > too_far:
+                    value = too_far
+                current[j] = value
+                if value < row_min:
+                    row_min = value
+
+            if row_min > max_distance:
+                return too_far
+
+            previous, current = current, previous
+
+        return min(previous[len2], too_far)
+
+    @staticmethod
+    def max_distance_for(threshold, max_len):
+        '''
+        Jarak terbesar d yang masih memenuhi 1 - d / max_len >= threshold
+        (pakai rumus yang sama dengan calculate_similarity)
+        '''
+        distance = int((1 - threshold) * max_len)
+        while distance < max_len and 1 - ((distance + 1) / max_len) >= threshold:
+            distance += 1
+        while distance >= 0 and 1 - (distance / max_len) < threshold:
+            distance -= 1
+        return distance
+
+    def calculate_similarity(self, word1, word2, threshold=None):
         '''
-        Menghitung score similaritynya berdasarkan levenshtein distance
+        Menghitung score similaritynya berdasarkan levenshtein distance.
+        Kalau threshold diberikan, similarity di bawah threshold tidak
+        dihitung persis (dijamin tetap < threshold).
         '''
         # cth
         # word1 -> keyword
         # word2 -> candidate n gram dari CV
 
-        distance = self.levenshtein_distance(word1, word2)
         max_len = max(len(word1), len(word2))
 
         if max_len == 0:
             return 1.0
+
+        if threshold is None:
+            distance = self.levenshtein_distance(word1, word2)
+        else:
+            max_distance = self.max_distance_for(threshold, max_len)
+            distance = self.levenshtein_distance_bounded(word1, word2, max_distance)
         
         similarity = 1 - (distance / max_len)
         return similarity
 
 
+    def cached_similarity(self, word1, word2, threshold):
+        '''calculate_similarity lewat memo (kalau aktif)'''
+        if self.memo is None:
+            return self.calculate_similarity(word1, word2, threshold)
+
+        key = (word1, word2, threshold)
+        similarity = self.memo.get(key)
+        if similarity is None:
+            similarity = self.calculate_similarity(word1, word2, threshold)
+            self.memo.put(key, similarity)
+        return similarity
+
+    @staticmethod
+    def _can_reach(word1, word2, threshold, word1_chars=None):
+        '''
+        Batas bawah murah untuk levenshtein: selisih panjang dan bag distance
+        (karakter yang tidak punya pasangan). False -> pasti similarity < threshold
+        '''
+        len1, len2 = len(word1), len(word2)
+        max_len = max(len1, len2)
+        if max_len == 0:
+            return True
+        if 1 - (abs(len1 - len2) / max_len) < threshold:
+            return False
+
+        remaining = dict(word1_chars) if word1_chars is not None else Counter(word1)
+        common = 0
+        for ch in word2:
+            if remaining.get(ch, 0) > 0:
+                remaining[ch] -= 1
+                common += 1
+        bag_distance = max(len1, len2) - common
+        return 1 - (bag_distance / max_len) >= threshold
+
+    def max_match_count(self, keyword, cv_text, threshold=None, cap=None):
+        '''
+        Upper bound of the count returned by fuzzy_search, without levenshtein.
+        Used to skip a CV that cannot enter the top results.
+        Counting stops once the bound exceeds cap (returns cap + 1).
+        '''
+        if threshold is None:
+            threshold = self.threshold
+
+        n = max(1, len(keyword.split()))
+        candidates = [(keyword, set(self.get_ngrams(cv_text, n)))]
+        if ' ' in keyword:
+            candidates.append((keyword.replace(' ', ''), set(self.get_ngrams(cv_text, 1))))
+
+        bound = 0
+        for target, phrases in candidates:
+            target_chars = Counter(target)
+            for phrase in phrases:
+                # Already scored on another CV -> exact answer, else lower bound
+                similarity = self.memo.peek((target, phrase, threshold)) if self.memo is not None else None
+                if similarity is not None:
+                    reachable = similarity >= threshold
+                else:
+                    reachable = self._can_reach(target, phrase, threshold, target_chars)
+                if reachable:
+                    bound += 1
+                    if cap is not None and bound > cap:
+                        return bound
+
+        return bound
+
     def fuzzy_search(self, keyword, cv_text, threshold=None):
         '''
         Find count & matching phrases, 
@@ -76,22 +262,24 @@ class FuzzyMatcher:
 
         n = max(1, len(keyword.split()))
 
-        ngrams = self.get_ngrams(cv_text, n)
+        # Each distinct n-gram is scored once per CV (first-occurrence order,
+        # so the result is the same as scoring every occurrence)
+        ngrams = dict.fromkeys(self.get_ngrams(cv_text, n))
 
 
         matches = []
 
         for phrase in ngrams:
-            similarity = self.calculate_similarity(keyword, phrase)
+            similarity = self.cached_similarity(keyword, phrase, threshold)
             if similarity >= threshold:
                 matches.append((similarity, phrase))
 
         if ' ' in keyword:
             clean_keyword = keyword.replace(' ', '')
-            single_words = self.get_ngrams(cv_text, 1) # individual words
+            single_words = dict.fromkeys(self.get_ngrams(cv_text, 1)) # individual words
 
             for word in single_words:
-                similarity = self.calculate_similarity(clean_keyword, word)
+                similarity = self.cached_similarity(clean_keyword, word, threshold)
                 if similarity >= threshold:
 
                     # Check if this match is already covered to avoid duplicates
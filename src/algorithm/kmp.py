@@ -27,22 +27,24 @@ class KMP_ATS:
         
         return lps
     
-    def kmp_search(self, text, pattern) -> list:
+    def kmp_search(self, text, pattern, lps=None) -> list:
         """
         Implementasi algoritma KMP untuk mencari semua kemunculan
-        pattern dalam text
+        pattern dalam text. lps bisa diberikan dari compute_lps
+        supaya tidak dihitung ulang untuk setiap text.
         """
         if not pattern:
-            return 0
+            return []
 
         n = len(text)
         m = len(pattern)
         
         if m == 0:
-            return 0
+            return []
         
         # Compute LPS array
-        lps = self.compute_lps(pattern)
+        if lps is None:
+            lps = self.compute_lps(pattern)
 
 
         found_indexes = []
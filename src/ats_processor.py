@@ -1,13 +1,22 @@
 import time
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 
 from algorithm.kmp import KMP_ATS
 from algorithm.bm import BM_ATS
-from algorithm.aho import AHO_ATS
+from algorithm.compiled_query import CompiledQuery
 from algorithm.fuzzy import FuzzyMatcher
-from utils.extract_pdf_match import extract_pdf_for_string_matching
+from utils.text_cache import TextCache
+from utils import pdf_backends
+from utils.top_n import TopN
+from index.inverted_index import InvertedIndex, DEFAULT_INDEX_PATH, partition_path
+from index.fuzzy_index import FuzzyIndex
+from index.corpus_file import CorpusFile
 
 class ATSProcessor:
-    def __init__(self, fuzzy_threshold=0.65, algorithm="KMP"):
+    def __init__(self, fuzzy_threshold=0.65, algorithm="KMP", text_cache=None, workers=1, use_index=False,
+                 prune=True, corpus_path=None):
         self.kmp = KMP_ATS()
         self.bm = BM_ATS()
         self.fuzzy = FuzzyMatcher(fuzzy_threshold)
@@ -16,20 +25,52 @@ class ATSProcessor:
         self.keywords = []
         self.exact_results = {}
         self.fuzzy_results = {}
+        self.compiled_query = None
+        self.text_cache = text_cache if text_cache is not None else TextCache()
+        self.workers = max(1, int(workers or 1))
+        self._pool = None
+        self.prune = prune
+        self.pruned = 0
+        self.index_path = DEFAULT_INDEX_PATH
+        self.index = InvertedIndex.load(self.index_path) if use_index else None
+        self.fuzzy_index = FuzzyIndex(self.index, self.fuzzy) if use_index else None
+        self.fuzzy_lookup = {}
+        self.partitions = {}  # role -> (InvertedIndex, FuzzyIndex, path) of that role's CVs
+        self.corpus = None
+        if corpus_path is not None:
+            self.open_corpus(corpus_path)
 
     # ======================== HELPERS ========================
 
     def set_algorithm(self, algo_name: str):
         """Ubah algoritma pencocokan exact (KMP / BM/ Aho-Corasick)"""
         if algo_name in ["KMP", "BM", "Aho-Corasick"]:
-            self.algorithm = algo_name.upper()
+            self.algorithm = algo_name
         else:
             print(f"Algorithm '{algo_name}' not recognized. Defaulting to KMP.")
             self.algorithm = "KMP"
 
-    def load_cv(self, cv_path: str):
-        """Load CV text content (cleaned long string) from its cv_path"""
-        self.cv_text = extract_pdf_for_string_matching(cv_path)
+    def compile_query(self):
+        """Preprocess self.keywords for self.algorithm (LPS / bad char / automaton)"""
+        self.compiled_query = CompiledQuery(self.keywords, self.algorithm, kmp=self.kmp, bm=self.bm)
+        return self.compiled_query
+
+    def load_cv(self, cv_path: str, detail_id=None):
+        """
+        Load CV text content (matching text of cv_path, cached on disk by TextCache).
+        With a corpus file open, the text of detail_id is sliced from the
+        mapping instead; CVs missing from it or changed since fall back to the cache.
+        """
+        if self.corpus is not None and detail_id is not None:
+            cv_text = self.corpus.text(detail_id, cv_path)
+            if cv_text is not None:
+                self.cv_text = cv_text
+                return
+        self.cv_text = self.text_cache.get(cv_path)
+
+    def load_row(self, cv):
+        """load_cv() for one dataset row"""
+        self.load_cv(cv['cv_path'], cv.get('detail_id'))
 
     def parse_keywords(self, raw_input: str) -> list:
         """
@@ -80,44 +121,17 @@ class ATSProcessor:
         # self.keywords = self.parse_keywords(keywords)
         self.exact_results = {}
 
-        # AHO
-        if self.algorithm == "Aho-Corasick":
-            if not self.keywords: 
-                return (0, 0)
-            
-            aho_instance = AHO_ATS(self.keywords)
-            found_matches = aho_instance.search_words(self.cv_text)
-            for keyword in self.keywords:
-                indices = found_matches.get(keyword, [])
-                if indices:
-                    self.exact_results[keyword] = {
-                        'count': len(indices), 
-                        'matches': [keyword] * len(indices)
-                    }
-
-            found_exact_keywords = set(self.exact_results.keys())
-            total_exact = sum(res.get('count', 0) for res in self.exact_results.values())
-            
-            print(f"Total exact matches: {total_exact}")
-            
-            return (total_exact, found_exact_keywords)
-        
-        # KMP/BM
-        else: 
-            for keyword in self.keywords:
-                indexes = []
-
-                if self.algorithm == "BM":
-                    indexes = self.bm.bm_search(self.cv_text, keyword)
-                else:
-                    indexes = self.kmp.kmp_search(self.cv_text, keyword)
-
-                count = len(indexes)
-                if count > 0:
-                    self.exact_results[keyword] = {
-                        'count': count,
-                        'matches': [keyword] * count
-                    }
+        # Compile once per query, reuse for every CV
+        if self.compiled_query is None or not self.compiled_query.matches(self.keywords, self.algorithm):
+            self.compile_query()
+
+        found_matches = self.compiled_query.search(self.cv_text)
+        for keyword, indexes in found_matches.items():
+            count = len(indexes)
+            self.exact_results[keyword] = {
+                'count': count,
+                'matches': [keyword] * count
+            }
 
         # simpen exact match
         found_exact_keywords = self.exact_results.keys()
@@ -126,26 +140,212 @@ class ATSProcessor:
         print(f"Total exact matches: {total_exact}")
         return (total_exact, found_exact_keywords)
     
-    def search_fuzzy(self, found_exact_keywords) -> dict:
-        """Algo untuk cari fuzzy match"""
+    def search_fuzzy(self, found_exact_keywords, must_exceed=None, cv_path=None):
+        """
+        Algo untuk cari fuzzy match
+
+        Args:
+            - found_exact_keywords: keywords skipped (already found exactly)
+            - must_exceed: if given, skip the CV when its total fuzzy count
+              provably cannot exceed it (upper bound from max_match_count)
+            - cv_path: current CV; keywords in self.fuzzy_lookup are then
+              answered from the fuzzy index instead of self.cv_text
+
+        Returns:
+            total fuzzy count, or None if skipped (self.fuzzy_results stays empty)
+        """
         # self.keywords = self.parse_keywords(keywords)
         self.fuzzy_results = {}
-
-        for keyword in self.keywords:
-            if keyword not in found_exact_keywords:
+        keywords = [kw for kw in dict.fromkeys(self.keywords) if kw not in found_exact_keywords]
+        indexed_matches = {}
+        if cv_path is not None:
+            for keyword in keywords:
+                if keyword in self.fuzzy_lookup:
+                    indexed_matches[keyword] = self.fuzzy_lookup[keyword].get(cv_path, [])
+
+        if must_exceed is not None:
+            bound = sum(len(matches) for matches in indexed_matches.values())
+            for keyword in keywords:
+                if bound > must_exceed:
+                    break
+                if keyword not in indexed_matches:
+                    bound += self.fuzzy.max_match_count(keyword, self.cv_text, cap=must_exceed - bound)
+            if bound <= must_exceed:
+                return None
+
+        for keyword in keywords:
+            if keyword in indexed_matches:
+                fuzzy_matches = indexed_matches[keyword]
+                fuzzy_count = len(fuzzy_matches)
+            else:
                 fuzzy_count, fuzzy_matches = self.fuzzy.fuzzy_search(keyword, self.cv_text, self.fuzzy.threshold)
-                if fuzzy_count > 0:
-                    self.fuzzy_results[keyword] = {
-                        'count': fuzzy_count,
-                        'matches': fuzzy_matches
-                    }
+            if fuzzy_count > 0:
+                self.fuzzy_results[keyword] = {
+                    'count': fuzzy_count,
+                    'matches': fuzzy_matches
+                }
 
         total_fuzzy = sum(res.get('count', 0) for res in self.fuzzy_results.values())
 
         print(f"Total fuzzy matches: {total_fuzzy}")
         return (total_fuzzy)
     
-    def get_top_search_results(self, top_n, keywords_str, cv_dataset):
+    @staticmethod
+    def display_name(cv):
+        """Full name of a cv dict, "" if its profile is not loaded yet (lazy loading)"""
+        if 'first_name' not in cv:
+            return ""
+        return cv['first_name'] + " " + cv['last_name']
+
+    def _make_exact_result(self, cv):
+        """Format self.exact_results of the current CV as a result card (None if no match)"""
+        total_matches = sum(res.get('count', 0) for res in self.exact_results.values())
+        if total_matches == 0:
+            return None
+
+        summary_list = []
+        for kw, res in self.exact_results.items():
+            summary_list.append(f"{kw}: {res['count']} (exact)")
+
+        return {
+            'data': cv,
+            'name': self.display_name(cv),
+            'match_count': total_matches,
+            'summary': summary_list
+        }
+
+    def _make_fuzzy_result(self, cv):
+        """Format self.fuzzy_results of the current CV as a result card (None if no match)"""
+        total_matches = sum(res.get('count', 0) for res in self.fuzzy_results.values())
+        if total_matches == 0:
+            return None
+
+        summary_list = []
+        for kw, res in self.fuzzy_results.items():
+            unique_phrases = list(set([phrase for similar, phrase in res['matches']]))
+
+            for phrase in unique_phrases:
+                phrase_count = sum(1 for similar, p in res['matches'] if p == phrase)
+                summary_list.append(f"'{phrase}': {phrase_count} (fuzzy for: {kw})")
+
+        return {
+            'data': cv,
+            'name': self.display_name(cv),
+            'match_count': total_matches,
+            'summary': summary_list
+        }
+
+    def _exact_pass(self, indexed_cvs, limit, keep_texts_below=0):
+        """
+        Exact stage over (index, cv) pairs. Counts come from self.index
+        postings when the index is enabled, otherwise each text is scanned.
+
+        Args:
+            - indexed_cvs: iterable of (index in cv_dataset, cv)
+            - limit: number of best results kept (bounded heap)
+            - keep_texts_below: keep loaded texts for the fuzzy stage while
+              fewer than this many CVs matched exactly (0 = never keep)
+
+        Returns:
+            - top: TopN of (index, result card); top.count = CVs with exact matches
+            - found_exact_keywords: keywords found in at least one CV
+            - loaded_texts: list of (index, cv, text) kept for the fuzzy stage
+              (text is None when the index was used, loaded on demand)
+        """
+        top = TopN(limit)
+        found_exact_keywords = []
+        loaded_texts = []
+
+        if self.index is not None:
+            keyword_counts = {kw: self.index.count(kw) for kw in dict.fromkeys(self.keywords)}
+
+        for idx, cv in indexed_cvs:
+            if self.index is not None:
+                if self.index.document_length(cv['cv_path']) == 0:
+                    print("Skip empty CV process")
+                    continue
+                self._exact_from_index(cv['cv_path'], keyword_counts)
+                cv_text = None
+            else:
+                self.load_row(cv)
+                if (self.cv_text == ""):
+                    print("Skip empty CV process")
+                    continue
+                self.search_exact()
+                cv_text = self.cv_text
+
+            result = self._make_exact_result(cv)
+            if result:
+                top.push(idx, result)
+
+            # found_exact_keywords
+            for keyword in self.exact_results.keys() :
+                if keyword not in found_exact_keywords:
+                    found_exact_keywords.append(keyword)
+
+            if top.count < keep_texts_below:
+                loaded_texts.append((idx, cv, cv_text))
+            elif loaded_texts:
+                loaded_texts = []
+
+        return top, found_exact_keywords, loaded_texts
+
+    def _exact_from_index(self, cv_path, keyword_counts):
+        """Fill self.exact_results of one CV from per-keyword index counts"""
+        self.exact_results = {}
+        for keyword, counts in keyword_counts.items():
+            count = counts.get(cv_path, 0)
+            if count > 0:
+                self.exact_results[keyword] = {
+                    'count': count,
+                    'matches': [keyword] * count
+                }
+
+    def _fuzzy_pass(self, indexed_texts, found_exact_keywords, limit):
+        """
+        Fuzzy stage over (index, cv, text) triples, in index order
+
+        With self.prune, a CV whose fuzzy count provably cannot beat the
+        worst of the current top `limit` is skipped (counted in self.pruned).
+
+        With the fuzzy index, single-word keywords are matched once against
+        the corpus vocabulary; texts are only loaded for multi-word keywords.
+
+        Returns:
+            - top: TopN of (index, result card)
+        """
+        top = TopN(limit)
+        needs_text = True
+        self.fuzzy_lookup = {}
+        if self.fuzzy_index is not None and limit > 0:
+            keywords = [kw for kw in dict.fromkeys(self.keywords) if kw not in found_exact_keywords]
+            self.fuzzy_lookup = {kw: self.fuzzy_index.search(kw) for kw in keywords if FuzzyIndex.supports(kw)}
+            needs_text = len(self.fuzzy_lookup) < len(keywords)
+
+        for idx, cv, cv_text in indexed_texts:
+            if limit <= 0:
+                break
+
+            if cv_text is None:
+                # Indexed exact stage (or a streamed dataset) does not load texts
+                if needs_text:
+                    self.load_row(cv)
+            else:
+                self.cv_text = cv_text
+
+            must_exceed = top.worst_count() if self.prune else None
+            if self.search_fuzzy(found_exact_keywords, must_exceed, cv['cv_path']) is None:
+                self.pruned += 1
+                continue
+
+            result = self._make_fuzzy_result(cv)
+            if result:
+                top.push(idx, result)
+
+        self.fuzzy_lookup = {}
+        return top
+
+    def get_top_search_results(self, top_n, keywords_str, cv_dataset, filters=None):
         """
         Get top_n cv that match keywords_str from cv_dataset with defined algorithm (or fuzzy if not found)
 
@@ -153,110 +353,341 @@ class ATSProcessor:
             - self
             - top_n: number of top matches result returned
             - keywords_str: keywords to match
-            - cv_dataset: JSON of all cv data (including profile and application)
+            - cv_dataset: JSON of all cv data (including profile and application),
+              or a re-iterable stream of rows (loader.stream_applications)
+            - filters: metadata filters applied before any PDF is read,
+              e.g. {'application_role': 'Chef'} (see filter_dataset)
         
         Returns:
             - top_results: List of top_n CVs that match keywords_str with result data to display
             - exact_match_time: Time taken for exact match process
             - fuzzy_match_time: Time taken for fuzzy match process
         """
+        self.keywords = self.parse_keywords(keywords_str)
+        self.text_cache.reset_stats()
+        if self.corpus is not None:
+            self.corpus.reset_stats()
+        self.pruned = 0
+        if self.fuzzy.memo is not None:
+            self.fuzzy.memo.reset_stats()
+
+        cv_dataset = self.filter_dataset(cv_dataset, filters)
+
+        with self._using_partition(filters):
+            if self.index is not None:
+                ranked, exact_match_time, fuzzy_match_time = self._search_sequential(top_n, cv_dataset)
+            elif self.workers > 1 and len(cv_dataset) >= 2 * self.workers:
+                # Shards are pickled to the workers, so a stream is materialized here
+                if not isinstance(cv_dataset, list):
+                    cv_dataset = list(cv_dataset)
+                ranked, exact_match_time, fuzzy_match_time = self._search_parallel(top_n, cv_dataset)
+            else:
+                ranked, exact_match_time, fuzzy_match_time = self._search_sequential(top_n, cv_dataset)
+
+        # Persist newly extracted texts
+        self.text_cache.flush()
+        self.text_cache.print_stats()
+        if self.corpus is not None:
+            self.corpus.print_stats()
+        if self.pruned:
+            print(f"Fuzzy stage skipped {self.pruned} CVs that could not reach the top {top_n}")
+        memo_stats = self.fuzzy.memo.stats() if self.fuzzy.memo is not None else None
+        if memo_stats and memo_stats['hits'] + memo_stats['misses'] > 0:
+            print(f"Similarity memo: {memo_stats['hits']} hits, {memo_stats['misses']} misses "
+                  f"({memo_stats['hit_rate'] * 100:.1f}% hit rate, {memo_stats['size']} entries)")
 
-        # Initialize Time
-        exact_start_time = None
-        exact_end_time = None
-        fuzzy_start_time = None
-        fuzzy_end_time = None
+        # Top results
+        top_results = [result for idx, result in ranked][:top_n]
+        return (top_results, exact_match_time, fuzzy_match_time)
 
-        # Store
-        all_results = []
-        self.keywords = self.parse_keywords(keywords_str)
-        found_exact_keywords = []
+    def _search_sequential(self, top_n, cv_dataset):
+        """Scan cv_dataset in this process (or answer from the index). Returns (ranked, exact_ms, fuzzy_ms)"""
+        if self.index is not None:
+            self.update_index(cv_dataset)
+        else:
+            self.compile_query()
 
         # Exact Match
-        # Exact match start time
+        # Texts are kept for the fuzzy stage, so no CV is loaded twice.
+        # Dropped as soon as top_n exact matches make fuzzy unnecessary.
+        # A streamed dataset keeps nothing: the fuzzy stage streams it again.
+        streaming = not isinstance(cv_dataset, (list, tuple))
         exact_start_time = time.time()
-        for cv in cv_dataset:
-            self.load_cv(cv['cv_path'])
-            if (self.cv_text == ""):
-                print("Skip empty CV process")
-                continue
+        exact_top, found_exact_keywords, loaded_texts = self._exact_pass(
+            enumerate(cv_dataset), top_n, 0 if streaming else top_n)
+        exact_match_time = int((time.time() - exact_start_time) * 1000)
 
-            self.search_exact()
-            total_matches = sum(res.get('count', 0) for res in self.exact_results.values())
+        ranked = exact_top.ranked()
 
-            if total_matches > 0:
-                summary_list = []
+        # Fuzzy Match (on the texts already loaded by the exact stage)
+        fuzzy_match_time = 0
+        if (exact_top.count < top_n):
+            fuzzy_start_time = time.time()
 
-                for kw, res in self.exact_results.items():
-                    summary_list.append(f"{kw}: {res['count']} (exact)")
-                
-                # Append formatted result
-                all_results.append({
-                    'data': cv,
-                    'name': cv['first_name'] + " " + cv['last_name'],
-                    'match_count': total_matches,
-                    'summary': summary_list
-                })
+            # Reset found_exact_keywords if all keywords already found
+            if len(self.keywords) <= len(found_exact_keywords):
+                found_exact_keywords = []
 
-            # found_exact_keywords
-            for keyword in self.exact_results.keys() :
+            remaining_result_count = top_n - exact_top.count
+            if streaming:
+                loaded_texts = ((idx, cv, None) for idx, cv in enumerate(cv_dataset))
+            fuzzy_top = self._fuzzy_pass(loaded_texts, found_exact_keywords, remaining_result_count)
+            fuzzy_match_time = int((time.time() - fuzzy_start_time) * 1000)
+
+            ranked += fuzzy_top.ranked()
+
+        return ranked, exact_match_time, fuzzy_match_time
+
+    # ======================== FILTERS ========================
+
+    @staticmethod
+    def filter_dataset(cv_dataset, filters):
+        """
+        Keep only the CVs matching filters (column -> value or list of values).
+        Datasets with a filter() method (loader.ApplicationStream) push the
+        filters into SQL; lists are filtered in memory. No PDF is read here.
+        """
+        if not filters:
+            return cv_dataset
+        if hasattr(cv_dataset, "filter"):
+            return cv_dataset.filter(filters)
+
+        def matches(cv):
+            for column, value in filters.items():
+                if isinstance(value, (list, tuple, set, frozenset)):
+                    if cv.get(column) not in value:
+                        return False
+                elif cv.get(column) != value:
+                    return False
+            return True
+
+        return [cv for cv in cv_dataset if matches(cv)]
+
+    def _role_partition(self, role):
+        """Index partition holding only the CVs of one role (loaded or created on first use)"""
+        if role not in self.partitions:
+            path = partition_path(self.index_path, role)
+            index = InvertedIndex.load(path)
+            self.partitions[role] = (index, FuzzyIndex(index, self.fuzzy), path)
+        return self.partitions[role]
+
+    @contextmanager
+    def _using_partition(self, filters):
+        """
+        With the index enabled and a single application_role filter, search
+        the role's own index partition, so postings and the fuzzy vocabulary
+        only cover that role's documents.
+        """
+        role = (filters or {}).get('application_role')
+        if self.index is None or role is None or isinstance(role, (list, tuple, set, frozenset)):
+            yield
+            return
+
+        saved = (self.index, self.fuzzy_index, self.index_path)
+        self.index, self.fuzzy_index, self.index_path = self._role_partition(role)
+        try:
+            yield
+        finally:
+            self.index, self.fuzzy_index, self.index_path = saved
+
+    # ======================== INVERTED INDEX ========================
+
+    def enable_index(self, cv_dataset=None, index_path=DEFAULT_INDEX_PATH):
+        """Answer exact matches from an InvertedIndex (loaded from index_path) instead of scanning"""
+        if self.index is None or index_path != self.index_path:
+            self.index_path = index_path
+            self.index = InvertedIndex.load(index_path)
+            self.fuzzy_index = FuzzyIndex(self.index, self.fuzzy)
+            self.partitions = {}
+        if cv_dataset is not None:
+            self.update_index(cv_dataset)
+
+    def disable_index(self):
+        self.index = None
+        self.fuzzy_index = None
+        self.partitions = {}
+
+    def update_index(self, cv_dataset):
+        """(Re-)index new or changed CVs of cv_dataset, save the index if anything changed"""
+        indexed = self.index.update(cv_dataset, self.text_cache)
+        if indexed > 0:
+            print(f"Indexed {indexed} CVs")
+            self.index.save(self.index_path)
+        return indexed
+
+    # ======================== CORPUS FILE ========================
+
+    def open_corpus(self, corpus_path):
+        """Read texts from a memory-mapped CorpusFile (built by src/ingest.py --corpus)"""
+        self.close_corpus()
+        corpus = CorpusFile.open(corpus_path)
+        if corpus is not None and corpus.backend != self.text_cache.backend:
+            print(f"Corpus file was built with {corpus.backend}, not {self.text_cache.backend}: ignoring it")
+            corpus.close()
+            corpus = None
+        self.corpus = corpus
+        self.close()  # workers open the corpus in their initializer
+        return corpus is not None
+
+    def close_corpus(self):
+        if self.corpus is not None:
+            self.corpus.close()
+            self.corpus = None
+
+    # ======================== PARALLEL SEARCH ========================
+
+    def set_workers(self, workers: int):
+        """Number of worker processes for get_top_search_results (1 = sequential)"""
+        workers = max(1, int(workers or 1))
+        if workers != self.workers:
+            self.close()
+        self.workers = workers
+
+    def _get_pool(self):
+        """Lazily start the worker pool (kept alive between searches)"""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.fuzzy.threshold, self.text_cache.cache_dir, self.text_cache.backend,
+                          self.corpus.path if self.corpus is not None else None),
+            )
+        return self._pool
+
+    def close(self):
+        """Shut down the worker pool, if any"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _make_shards(self, cv_dataset):
+        """Split cv_dataset into contiguous (index, cv) chunks, a few per worker for balance"""
+        indexed = list(enumerate(cv_dataset))
+        shard_count = min(len(indexed), self.workers * 4)
+        shard_size = -(-len(indexed) // shard_count)
+        return [indexed[i:i + shard_size] for i in range(0, len(indexed), shard_size)]
+
+    def _search_parallel(self, top_n, cv_dataset):
+        """
+        Shard cv_dataset across worker processes. Each shard returns its own
+        top results with dataset indices, merged with the same ordering as
+        the sequential scan. Returns (ranked, exact_ms, fuzzy_ms)
+        """
+        pool = self._get_pool()
+        shards = self._make_shards(cv_dataset)
+
+        # Exact Match
+        exact_start_time = time.time()
+        exact_top = TopN(top_n)
+        exact_count = 0
+        found_exact_keywords = []
+        jobs = [(shard, self.keywords, self.algorithm, top_n) for shard in shards]
+        for shard_top, shard_count, shard_keywords, cache_stats, corpus_stats in pool.map(_exact_shard, jobs):
+            exact_top.extend(shard_top)
+            exact_count += shard_count
+            self.text_cache.merge_stats(cache_stats)
+            self._merge_corpus_stats(corpus_stats)
+            for keyword in shard_keywords:
                 if keyword not in found_exact_keywords:
                     found_exact_keywords.append(keyword)
-        
-        # Exact match end time
-        exact_end_time = time.time()
-        exact_match_time = int((exact_end_time - exact_start_time) * 1000)
-        
-        # Sort exact results
-        sorted_exact_results = sorted(all_results, key=lambda x: x['match_count'], reverse=True)
+        exact_match_time = int((time.time() - exact_start_time) * 1000)
+
+        ranked = exact_top.ranked()
 
         # Fuzzy Match
-        fuzzy_results = []
         fuzzy_match_time = 0
-        if (len(all_results) < top_n):
-            # Fuzzy match start time
+        if exact_count < top_n:
             fuzzy_start_time = time.time()
 
             # Reset found_exact_keywords if all keywords already found
             if len(self.keywords) <= len(found_exact_keywords):
                 found_exact_keywords = []
 
-            for cv in cv_dataset: 
-                self.load_cv(cv['cv_path'])
-                self.search_fuzzy(found_exact_keywords)
-                total_matches = sum(res.get('count', 0) for res in self.fuzzy_results.values())
-
-                if total_matches > 0:
-                    summary_list = []
-                    
-                    for kw, res in self.fuzzy_results.items():
-                        unique_phrases = list(set([phrase for similar, phrase in res['matches']]))
-
-                        for phrase in unique_phrases:
-                            phrase_count = sum(1 for similar, p in res['matches'] if p == phrase)
-                            summary_list.append(f"'{phrase}': {phrase_count} (fuzzy for: {kw})")
-                    
-                    fuzzy_results.append({
-                        'data': cv,
-                        'name': cv['first_name'] + " " + cv['last_name'],
-                        'match_count': total_matches,
-                        'summary': summary_list
-                    })
-            
-            # Fuzzy match end time
-            fuzzy_end_time = time.time()
-            fuzzy_match_time = int((fuzzy_end_time - fuzzy_start_time) * 1000)
-
-            # Update sorted_exact_results  
-            sorted_fuzzy_results = sorted(fuzzy_results, key=lambda x: x['match_count'], reverse=True)
-            remaining_result_count = top_n - len(all_results)
-            top_fuzzy_results = sorted_fuzzy_results[:remaining_result_count]
-            sorted_exact_results += top_fuzzy_results
-
-        
-        # Top results
-        top_results = sorted_exact_results[:top_n]
-        return (top_results, exact_match_time, fuzzy_match_time)
+            remaining_result_count = top_n - exact_count
+            fuzzy_top = TopN(remaining_result_count)
+            jobs = [(shard, self.keywords, found_exact_keywords, remaining_result_count, self.prune) for shard in shards]
+            for shard_top, shard_pruned, cache_stats, memo_stats, corpus_stats in pool.map(_fuzzy_shard, jobs):
+                fuzzy_top.extend(shard_top)
+                self.pruned += shard_pruned
+                self.text_cache.merge_stats(cache_stats)
+                self._merge_corpus_stats(corpus_stats)
+                if self.fuzzy.memo is not None and memo_stats is not None:
+                    self.fuzzy.memo.hits += memo_stats['hits']
+                    self.fuzzy.memo.misses += memo_stats['misses']
+            fuzzy_match_time = int((time.time() - fuzzy_start_time) * 1000)
+
+            ranked += fuzzy_top.ranked()
+
+        # Results point back at the caller's cv dicts, not worker copies
+        for idx, result in ranked:
+            result['data'] = cv_dataset[idx]
+
+        return ranked, exact_match_time, fuzzy_match_time
+
+    def _merge_corpus_stats(self, corpus_stats):
+        if self.corpus is not None and corpus_stats is not None:
+            self.corpus.merge_stats(corpus_stats)
+
+    def _reset_worker_stats(self):
+        """Per-job counters of a worker process (sent back with its results)"""
+        self.text_cache.reset_stats()
+        if self.corpus is not None:
+            self.corpus.reset_stats()
+
+    def _corpus_stats(self):
+        return self.corpus.stats() if self.corpus is not None else None
+
+
+# ======================== WORKER PROCESS ========================
+
+_worker_processor = None
+
+
+def _init_worker(fuzzy_threshold, cache_dir, backend, corpus_path):
+    """Pool initializer: one ATSProcessor per worker process (same PDF backend and corpus as the parent)"""
+    global _worker_processor
+    pdf_backends.configure(backend)
+    _worker_processor = ATSProcessor(fuzzy_threshold, text_cache=TextCache(cache_dir, backend=backend),
+                                     corpus_path=corpus_path)
+
+
+def _exact_shard(job):
+    """Exact stage for one shard -> (top results, match count, found keywords, cache stats, corpus stats)"""
+    shard, keywords, algorithm, top_n = job
+    processor = _worker_processor
+    processor.keywords = keywords
+    processor.algorithm = algorithm
+    processor._reset_worker_stats()
+    if processor.compiled_query is None or not processor.compiled_query.matches(keywords, algorithm):
+        processor.compile_query()
+
+    top, found_exact_keywords, _ = processor._exact_pass(shard, top_n)
+    processor.text_cache.flush()
+    return top.ranked(), top.count, found_exact_keywords, processor.text_cache.stats(), processor._corpus_stats()
+
+
+def _fuzzy_shard(job):
+    """Fuzzy stage for one shard -> (top results, pruned CVs, cache stats, memo stats, corpus stats)"""
+    shard, keywords, found_exact_keywords, limit, prune = job
+    processor = _worker_processor
+    processor.keywords = keywords
+    processor.prune = prune
+    processor.pruned = 0
+    processor._reset_worker_stats()
+    if processor.fuzzy.memo is not None:
+        processor.fuzzy.memo.reset_stats()
+
+    indexed_texts = []
+    for idx, cv in shard:
+        processor.load_row(cv)
+        if processor.cv_text:
+            indexed_texts.append((idx, cv, processor.cv_text))
+
+    top = processor._fuzzy_pass(indexed_texts, found_exact_keywords, limit)
+    processor.text_cache.flush()
+    memo_stats = processor.fuzzy.memo.stats() if processor.fuzzy.memo is not None else None
+    return top.ranked(), processor.pruned, processor.text_cache.stats(), memo_stats, processor._corpus_stats()
 
 
 # ========== Example Use ==========
@@ -0,0 +1,72 @@
+import os
+import sys
+import glob
+import time
+import random
+from collections import Counter
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from algorithm.aho import AHO_ATS, AHO_ARRAY_ATS
+from algorithm.kmp import KMP_ATS
+from utils.text_cache import TextCache
+
+
+def load_corpus(data_dir="data"):
+    """Load normalized text of every PDF in data/ (through the text cache)"""
+    cache = TextCache()
+    paths = sorted(glob.glob(os.path.join(data_dir, "*", "*.pdf")))
+    texts = [cache.get(path) for path in paths]
+    cache.flush()
+    return [text for text in texts if text]
+
+
+def pick_keywords(texts, count, seed=0):
+    """Pick count keywords from the corpus vocabulary (mix of words and 2-word phrases)"""
+    vocab = Counter(word for text in texts for word in text.split() if len(word) > 3)
+    common = [word for word, _ in vocab.most_common(count * 4)]
+    rng = random.Random(seed)
+    keywords = rng.sample(common, min(count, len(common)))
+    for i in range(0, len(keywords), 5):
+        keywords[i] = keywords[i] + " " + rng.choice(common)
+    return keywords
+
+
+def run(aho_class, keywords, texts):
+    """Returns (build_ms, scan_ms, total_matches)"""
+    start = time.perf_counter()
+    aho = aho_class(keywords)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    total = 0
+    for text in texts:
+        total += sum(len(indexes) for indexes in aho.search_words(text).values())
+    scan_time = time.perf_counter() - start
+
+    return build_time * 1000, scan_time * 1000, total
+
+
+def main():
+    texts = load_corpus()
+    total_chars = sum(len(text) for text in texts)
+    print(f"Corpus: {len(texts)} CVs, {total_chars} characters\n")
+
+    kmp = KMP_ATS()
+    print(f"{'keywords':>8} | {'class':<14} | {'build ms':>9} | {'scan ms':>9} | {'matches':>8} | {'KMP matches':>11}")
+    print("-" * 75)
+
+    for count in (5, 50, 300):
+        keywords = pick_keywords(texts, count)
+        kmp_total = sum(len(kmp.kmp_search(text, kw)) for text in texts for kw in keywords)
+
+        for aho_class in (AHO_ATS, AHO_ARRAY_ATS):
+            build_ms, scan_ms, total = run(aho_class, keywords, texts)
+            print(f"{count:>8} | {aho_class.__name__:<14} | {build_ms:>9.1f} | {scan_ms:>9.1f} | {total:>8} | {kmp_total:>11}")
+        print("-" * 75)
+
+    # AHO_ATS strips punctuation from the text and maps non a-z characters
+    # to 'a', so its counts can differ from KMP. AHO_ARRAY_ATS must not.
+
+
+if __name__ == "__main__":
+    main()
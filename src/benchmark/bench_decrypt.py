@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+import random
+import string
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmark.bench_env import load_env
+load_env()
+from database.rsa import rsa_encrypt, rsa_decrypt
+from database.hybrid import encrypt_record, decrypt_record
+
+FIELDS = ("first_name", "last_name", "address", "phone_number", "date_of_birth")
+
+
+def make_plain_rows(count, seed=0):
+    """Synthetic plaintext applicant profiles (same fields as applicantprofile)"""
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        rows.append({
+            "first_name": rng.choice(string.ascii_uppercase) + "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 8))),
+            "last_name": rng.choice(string.ascii_uppercase) + "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))),
+            "address": f"Jl. {''.join(rng.choices(string.ascii_letters, k=10))} No. {rng.randint(1, 200)}, Bandung",
+            "phone_number": "08" + "".join(rng.choices(string.digits, k=10)),
+            "date_of_birth": f"{rng.randint(1970, 2004)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        })
+    return rows
+
+
+def make_rows(count, seed=0):
+    """Synthetic profiles in the legacy per-character RSA format"""
+    return [{field: rsa_encrypt(value) for field, value in plain.items()} for plain in make_plain_rows(count, seed)]
+
+
+def decrypt_rows(rows, chunk_cache=None):
+    return [{field: rsa_decrypt(row[field], chunk_cache) for field in FIELDS} for row in rows]
+
+
+def compare_formats(count=200):
+    """Stored size and decrypt time: per-character RSA vs hybrid (database.hybrid)"""
+    plain_rows = make_plain_rows(count)
+    legacy_rows = make_rows(count)
+    hybrid_rows = [encrypt_record(plain) for plain in plain_rows]
+
+    legacy_bytes = sum(len(row[field]) for row in legacy_rows for field in FIELDS)
+    hybrid_bytes = sum(len(key) + sum(len(value) for value in fields.values()) for key, fields in hybrid_rows)
+
+    start = time.perf_counter()
+    chunk_cache = {}
+    legacy = decrypt_rows(legacy_rows, chunk_cache)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    hybrid = [decrypt_record(key, fields) for key, fields in hybrid_rows]
+    hybrid_time = time.perf_counter() - start
+
+    assert legacy == plain_rows and hybrid == plain_rows
+    print(f"\n{count} profiles   | {'bytes stored':>12} | {'bytes/row':>9} | {'decrypt s':>9}")
+    print("-" * 55)
+    print(f"{'per-char RSA':<14} | {legacy_bytes:>12} | {legacy_bytes // count:>9} | {legacy_time:>9.3f}")
+    print(f"{'hybrid':<14} | {hybrid_bytes:>12} | {hybrid_bytes // count:>9} | {hybrid_time:>9.3f}")
+
+
+def main():
+    print(f"{'rows':>6} | {'chunks':>7} | {'plain s':>8} | {'memo s':>8} | {'distinct':>8} | {'speedup':>7}")
+    print("-" * 60)
+    for count in (20, 100, 200):
+        rows = make_rows(count)
+        chunks = sum(len(row[field].split()) for row in rows for field in FIELDS)
+
+        start = time.perf_counter()
+        plain = decrypt_rows(rows)
+        plain_time = time.perf_counter() - start
+
+        chunk_cache = {}
+        start = time.perf_counter()
+        memo = decrypt_rows(rows, chunk_cache)
+        memo_time = time.perf_counter() - start
+
+        assert plain == memo
+        print(f"{count:>6} | {chunks:>7} | {plain_time:>8.2f} | {memo_time:>8.3f} | {len(chunk_cache):>8} | {plain_time / memo_time:>6.0f}x")
+
+    compare_formats()
+
+
+if __name__ == "__main__":
+    main()
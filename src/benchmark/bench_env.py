@@ -0,0 +1,15 @@
+import os
+
+from dotenv import load_dotenv
+
+EXAMPLE_ENV = os.path.join(os.path.dirname(__file__), '..', '..', '.env.example')
+
+
+def load_env():
+    """
+    Load .env, then fill whatever it leaves unset from .env.example so the
+    benchmarks run on a fresh checkout with the example keypair.
+    Must run before database.rsa is imported (it reads the keys at import).
+    """
+    load_dotenv()
+    load_dotenv(EXAMPLE_ENV)
@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+import builtins
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmark.bench_env import load_env
+load_env()
+from database import db
+
+
+def quiet(func, *args, **kwargs):
+    """Run func without its progress prints"""
+    _print = builtins.print
+    builtins.print = lambda *a, **k: None
+    try:
+        return func(*args, **kwargs)
+    finally:
+        builtins.print = _print
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = quiet(func, *args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main(sqlite_path=None):
+    """Seed a throwaway SQLite database with tubes3_seeding.sql, then time the load and search paths"""
+    if sqlite_path is None:
+        sqlite_path = os.path.join(tempfile.mkdtemp(), "ats_bench.sqlite3")
+    db.configure("sqlite", sqlite_path)
+
+    from database import loader
+    from database.create_tables import create_tables
+    from database.official_seeder import seed_data
+    from ats_processor import ATSProcessor
+
+    _, create_ms = timed(create_tables)
+    _, seed_ms = timed(seed_data)
+    full, full_ms = timed(loader.load_all_data)
+    lazy, lazy_ms = timed(loader.load_search_data)
+    _, attach_ms = timed(loader.attach_profiles, lazy[:10])
+
+    processor = ATSProcessor()
+    quiet(processor.get_top_search_results, 10, "python", lazy)  # warm the text cache
+    (_, exact_ms, fuzzy_ms), search_ms = timed(processor.get_top_search_results, 10, "python, react, sql", lazy)
+
+    print(f"SQLite database: {sqlite_path} ({len(full)} applications)\n")
+    print(f"{'step':<36} | {'ms':>9}")
+    print("-" * 48)
+    print(f"{'create_tables':<36} | {create_ms:>9.1f}")
+    print(f"{'official_seeder.seed_data':<36} | {seed_ms:>9.1f}")
+    print(f"{'load_all_data (decrypt everything)':<36} | {full_ms:>9.1f}")
+    print(f"{'load_search_data (lazy)':<36} | {lazy_ms:>9.1f}")
+    print(f"{'attach_profiles (top 10)':<36} | {attach_ms:>9.1f}")
+    print(f"{'search (exact {0} ms, fuzzy {1} ms)'.format(exact_ms, fuzzy_ms):<36} | {search_ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import os
+import sys
+import glob
+import time
+import argparse
+from collections import Counter
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils import pdf_backends
+from utils.extract_pdf_match import _clean_text
+from benchmark.bench_aho import pick_keywords
+
+
+def extract_all(extractor, paths):
+    """Returns ({path: normalized text}, pages, failures, seconds)"""
+    texts = {}
+    pages = 0
+    failures = 0
+    start = time.perf_counter()
+    for path in paths:
+        try:
+            page_texts = extractor.extract_pages(path)
+        except ImportError:
+            raise
+        except Exception:
+            failures += 1
+            texts[path] = ""
+            continue
+        pages += len(page_texts)
+        texts[path] = _clean_text("".join(text + "\n" for text in page_texts if text))
+    return texts, pages, failures, time.perf_counter() - start
+
+
+def match_counts(texts, keywords):
+    """keyword -> total occurrences over the corpus (str.count, same as exact matching)"""
+    return Counter({kw: sum(text.count(kw) for text in texts.values()) for kw in keywords})
+
+
+def equivalence(reference, texts, keywords, reference_counts):
+    """(identical texts, mean token overlap, keywords whose corpus match count changed)"""
+    identical = 0
+    overlap = 0.0
+    for path, ref_text in reference.items():
+        text = texts.get(path, "")
+        if text == ref_text:
+            identical += 1
+            overlap += 1.0
+            continue
+        ref_tokens, tokens = Counter(ref_text.split()), Counter(text.split())
+        union = sum((ref_tokens | tokens).values())
+        overlap += sum((ref_tokens & tokens).values()) / union if union else 1.0
+
+    counts = match_counts(texts, keywords)
+    changed = sum(1 for kw in keywords if counts[kw] != reference_counts[kw])
+    return identical, overlap / max(len(reference), 1), changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF text extraction backends: throughput and equivalence to PyPDF2")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--limit", type=int, default=None, help="only the first N PDFs")
+    parser.add_argument("--keywords", type=int, default=100, help="keywords used to compare match counts")
+    parser.add_argument("--backends", default=",".join(pdf_backends.BACKENDS))
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.data_dir, "*", "*.pdf")))[:args.limit]
+    print(f"Corpus: {len(paths)} PDFs\n")
+
+    reference, ref_pages, ref_failures, ref_time = extract_all(pdf_backends.PyPDF2Extractor(), paths)
+    keywords = pick_keywords([text for text in reference.values() if text], args.keywords)
+    reference_counts = match_counts(reference, keywords)
+
+    print(f"{'backend':<10} | {'seconds':>8} | {'pages/s':>8} | {'files/s':>8} | {'failed':>6} | "
+          f"{'identical':>9} | {'overlap':>7} | {'kw counts changed':>17}")
+    print("-" * 96)
+
+    for name in args.backends.split(","):
+        name = name.strip()
+        if name == pdf_backends.PyPDF2Extractor.name:
+            texts, pages, failures, seconds = reference, ref_pages, ref_failures, ref_time
+        else:
+            try:
+                texts, pages, failures, seconds = extract_all(pdf_backends.BACKENDS[name](), paths)
+            except ImportError as e:
+                print(f"{name:<10} | not installed ({e})")
+                continue
+
+        identical, overlap, changed = equivalence(reference, texts, keywords, reference_counts)
+        print(f"{name:<10} | {seconds:>8.2f} | {pages / seconds:>8.1f} | {len(paths) / seconds:>8.1f} | {failures:>6} | "
+              f"{identical:>4}/{len(paths):<4} | {overlap * 100:>6.1f}% | {changed:>8}/{len(keywords):<8}")
+
+    # overlap: multiset token Jaccard against PyPDF2, averaged over PDFs.
+    # Switch ATS_PDF_BACKEND only to a backend that keeps keyword counts stable.
+
+
+if __name__ == "__main__":
+    main()
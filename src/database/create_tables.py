@@ -1,62 +1,58 @@
 import os
-import mysql.connector
-from dotenv import load_dotenv
+import sys
 
-def create_tables():
-    load_dotenv()
-
-    # Create database if not exist
-    conn = mysql.connector.connect(
-        host="localhost",
-        user=os.getenv("MYSQL_USER"),
-        password=os.getenv("MYSQL_PASSWORD"),
-    )
-    cursor = conn.cursor()
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from database import db
 
-    cursor.execute("CREATE DATABASE IF NOT EXISTS ATS;")
-    print("Database 'ATS' ensured.")
-    cursor.close()
-    conn.close()
+def create_tables():
+    # Create database if not exist (MySQL only, the SQLite file is created on connect)
+    if db.get_backend() == "mysql":
+        with db.server_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("CREATE DATABASE IF NOT EXISTS ATS;")
+            print("Database 'ATS' ensured.")
+            cursor.close()
 
     # Connection with ATS database
-    conn = mysql.connector.connect(
-        host="localhost",
-        user=os.getenv("MYSQL_USER"),
-        password=os.getenv("MYSQL_PASSWORD"),
-        database="ats"
-    )
-    cursor = conn.cursor()
-
-    # Drop existing tables
-    cursor.execute("DROP TABLE IF EXISTS ApplicationDetail;")
-    cursor.execute("DROP TABLE IF EXISTS ApplicantProfile;")
-    print("Existing tables dropped.")
-
-    # Make tables
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS ApplicantProfile (
-        applicant_id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
-        first_name TEXT DEFAULT NULL,
-        last_name TEXT DEFAULT NULL,
-        date_of_birth TEXT DEFAULT NULL,
-        address TEXT DEFAULT NULL,
-        phone_number TEXT DEFAULT NULL
-    );
-    """)
-
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS ApplicationDetail (
-        detail_id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
-        applicant_id INT NOT NULL,
-        application_role VARCHAR(100) DEFAULT NULL,
-        cv_path TEXT,
-        FOREIGN KEY (applicant_id) REFERENCES ApplicantProfile(applicant_id)
-    );
-    """)
+    with db.transaction() as cursor:
+        # Drop existing tables
+        cursor.execute("DROP TABLE IF EXISTS ApplicationDetail;")
+        cursor.execute("DROP TABLE IF EXISTS ApplicantProfile;")
+        print("Existing tables dropped.")
+
+        # Make tables
+        cursor.execute(db.adapt_sql("""
+        CREATE TABLE IF NOT EXISTS ApplicantProfile (
+            applicant_id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+            first_name TEXT DEFAULT NULL,
+            last_name TEXT DEFAULT NULL,
+            date_of_birth TEXT DEFAULT NULL,
+            address TEXT DEFAULT NULL,
+            phone_number TEXT DEFAULT NULL,
+            record_key TEXT DEFAULT NULL
+        );
+        """))
+
+        cursor.execute(db.adapt_sql("""
+        CREATE TABLE IF NOT EXISTS ApplicationDetail (
+            detail_id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+            applicant_id INT NOT NULL,
+            application_role VARCHAR(100) DEFAULT NULL,
+            cv_path TEXT,
+            FOREIGN KEY (applicant_id) REFERENCES ApplicantProfile(applicant_id)
+        );
+        """))
+
+        create_indexes(cursor)
 
     print("Tables created successfully.")
-    cursor.close()
-    conn.close()
+
+def create_indexes(cursor):
+    """Secondary indexes (also re-created by official_seeder after its SQL script)"""
+    # Role-filtered searches (loader filters on application_role)
+    if not db.has_index(cursor, "ApplicationDetail", "idx_application_role"):
+        cursor.execute("CREATE INDEX idx_application_role ON ApplicationDetail (application_role)")
+        print("Index idx_application_role created.")
 
 if __name__ == "__main__":
     create_tables()
@@ -0,0 +1,388 @@
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+DATABASE_NAME = "ats"
+DEFAULT_SQLITE_PATH = os.path.join(".cache", "ats.sqlite3")
+
+# Errors raised by either backend (mysql-connector is optional with SQLite)
+try:
+    from mysql.connector import Error as _MySQLError
+    Error = (_MySQLError, sqlite3.Error)
+except ImportError:
+    Error = (sqlite3.Error,)
+
+_pool = None
+_backend = None
+_sqlite_path = None
+
+
+# ======================== CONFIG ========================
+
+def configure(backend=None, sqlite_path=None):
+    """
+    Select the storage backend: "mysql" (default) or "sqlite".
+    Without arguments, DB_BACKEND and SQLITE_PATH are read from .env.
+    """
+    global _backend, _sqlite_path, _pool
+    load_dotenv()
+    _backend = (backend or os.getenv("DB_BACKEND", "mysql")).lower()
+    _sqlite_path = sqlite_path or os.getenv("SQLITE_PATH", DEFAULT_SQLITE_PATH)
+    _pool = None
+    if _backend not in ("mysql", "sqlite"):
+        raise ValueError(f"Unknown DB_BACKEND '{_backend}' (expected mysql or sqlite)")
+
+
+def get_backend() -> str:
+    if _backend is None:
+        configure()
+    return _backend
+
+
+def connection_config(database=DATABASE_NAME) -> dict:
+    """Connection settings from .env (MYSQL_HOST, MYSQL_USER, MYSQL_PASSWORD)"""
+    load_dotenv()
+    config = {
+        "host": os.getenv("MYSQL_HOST", "localhost"),
+        "user": os.getenv("MYSQL_USER"),
+        "password": os.getenv("MYSQL_PASSWORD"),
+    }
+    if database:
+        config["database"] = database
+    return config
+
+
+def get_pool():
+    """
+    Process-wide connection pool to the ats database (created on first use).
+    Size from DB_POOL_SIZE in .env (default 5).
+    """
+    global _pool
+    if _pool is None:
+        from mysql.connector import pooling
+
+        load_dotenv()
+        _pool = pooling.MySQLConnectionPool(
+            pool_name="ats_pool",
+            pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+            pool_reset_session=True,
+            **connection_config(),
+        )
+    return _pool
+
+
+# ======================== SQLITE BACKEND ========================
+
+class SQLiteCursor:
+    """sqlite3 cursor with the mysql.connector interface used here (%s placeholders, column_names)"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _qmark(operation):
+        """%s -> ? outside string literals and comments"""
+        return "".join(segment.replace("%s", "?") if is_code else segment
+                       for segment, is_code in _scan_sql(operation))
+
+    def execute(self, operation, params=()):
+        self._cursor.execute(self._qmark(operation), tuple(params or ()))
+
+    def executemany(self, operation, seq_params):
+        self._cursor.executemany(self._qmark(operation), seq_params)
+
+    @property
+    def column_names(self):
+        return tuple(column[0] for column in self._cursor.description or ())
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size=1):
+        return self._cursor.fetchmany(size)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """sqlite3 connection with the subset of the mysql.connector interface used here"""
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+
+    def cursor(self, prepared=False):
+        # sqlite3 caches compiled statements itself, prepared is accepted for compatibility
+        return SQLiteCursor(self._conn.cursor())
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+
+# ======================== CONNECTIONS ========================
+
+@contextmanager
+def connection():
+    """Borrow a pooled connection (MySQL) or open the SQLite file, closed on exit"""
+    if get_backend() == "sqlite":
+        conn = SQLiteConnection(_sqlite_path)
+    else:
+        conn = get_pool().get_connection()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+@contextmanager
+def server_connection():
+    """Unpooled connection without a default database (for CREATE DATABASE, MySQL only)"""
+    import mysql.connector
+
+    conn = mysql.connector.connect(**connection_config(database=None))
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+@contextmanager
+def transaction(conn=None):
+    """
+    Cursor inside a transaction: commit on success, rollback on error.
+
+    Args:
+        - conn: reuse an open connection instead of borrowing one from the pool
+    """
+    if conn is None:
+        with connection() as pooled:
+            with transaction(pooled) as cursor:
+                yield cursor
+        return
+
+    cursor = conn.cursor()
+    try:
+        yield cursor
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+@contextmanager
+def query(conn=None, prepared=False):
+    """
+    Read-only cursor on a pooled (or given) connection.
+
+    Args:
+        - conn: reuse an open connection instead of borrowing one from the pool
+        - prepared: server-side prepared statements (MySQL), for one
+          statement executed many times on the cursor
+    """
+    if conn is None:
+        with connection() as pooled:
+            with query(pooled, prepared) as cursor:
+                yield cursor
+        return
+
+    cursor = conn.cursor(prepared=True) if prepared else conn.cursor()
+    try:
+        yield cursor
+    finally:
+        cursor.close()
+
+
+# ======================== DIALECT ========================
+
+def _scan_sql(script):
+    """
+    Split SQL text into (segment, is_code) pairs. '...', "..." and `...`
+    literals (with '' or backslash escapes), -- / # line comments and
+    /* */ block comments are non-code segments, everything else is code.
+    """
+    code = []
+    i = 0
+    length = len(script)
+    while i < length:
+        char = script[i]
+
+        if char in "'\"`":
+            end = i + 1
+            while end < length:
+                if script[end] == "\\" and char != "`":
+                    end += 2
+                    continue
+                if script[end] == char:
+                    if end + 1 < length and script[end + 1] == char:
+                        end += 2  # doubled quote
+                        continue
+                    break
+                end += 1
+            segment = script[i:end + 1]
+        elif script.startswith("--", i) or char == "#":
+            end = script.find("\n", i)
+            end = length if end == -1 else end
+            segment = script[i:end]
+            end -= 1
+        elif script.startswith("/*", i):
+            end = script.find("*/", i + 2)
+            end = length if end == -1 else end + 2
+            segment = script[i:end]
+            end -= 1
+        else:
+            code.append(char)
+            i += 1
+            continue
+
+        if code:
+            yield "".join(code), True
+            code = []
+        yield segment, False
+        i = end + 1
+
+    if code:
+        yield "".join(code), True
+
+
+def split_sql(script):
+    """
+    Split a SQL script into statements on top-level semicolons.
+    Semicolons inside '...', "..." and `...` (with '' or backslash escapes),
+    -- / # line comments and /* */ block comments do not split.
+
+    Returns: list of statements (without the trailing semicolon)
+    """
+    statements = []
+    current = []
+    for segment, is_code in _scan_sql(script):
+        if not is_code:
+            current.append(segment)
+            continue
+        parts = segment.split(";")
+        current.append(parts[0])
+        for part in parts[1:]:
+            statements.append("".join(current))
+            current = [part]
+
+    statements.append("".join(current))
+    return [statement.strip() for statement in statements if _strip_leading_comments(statement).strip()]
+
+
+def execute_script(cursor, script, on_error=None):
+    """
+    Execute every statement of a SQL script (split_sql + adapt_sql) on cursor.
+    A failing statement is passed to on_error(statement, error) and skipped,
+    or raises when on_error is None.
+
+    Returns: number of statements executed
+    """
+    executed = 0
+    for statement in split_sql(script):
+        statement = adapt_sql(statement)
+        if not statement:
+            continue
+        try:
+            cursor.execute(statement)
+        except Error as err:
+            if on_error is None:
+                raise
+            on_error(statement, err)
+            continue
+        executed += 1
+    return executed
+
+
+def _strip_leading_comments(statement):
+    return re.sub(r'^(\s*(--|#)[^\n]*(\n|$)|\s*/\*.*?\*/)*\s*', '', statement, flags=re.DOTALL)
+
+
+def adapt_sql(statement):
+    """
+    Translate a MySQL statement (create_tables.py / tubes3_seeding.sql) for
+    the current backend. Returns None when the statement has no equivalent
+    and should be skipped (SET ..., CREATE DATABASE on SQLite).
+    """
+    if get_backend() != "sqlite":
+        return statement
+
+    head = _strip_leading_comments(statement).upper()
+    if head.startswith("SET ") or head.startswith("CREATE DATABASE"):
+        return None
+
+    statement = re.sub(r'\bINT\s+(NOT\s+NULL\s+)?AUTO_INCREMENT\s+PRIMARY\s+KEY',
+                       'INTEGER PRIMARY KEY AUTOINCREMENT', statement, flags=re.IGNORECASE)
+    statement = re.sub(r'\)\s*ENGINE\s*=[^;]*$', ')', statement.rstrip(), flags=re.IGNORECASE)
+    return statement
+
+
+def has_column(cursor, table, column) -> bool:
+    if get_backend() == "sqlite":
+        cursor.execute(f"PRAGMA table_info({table})")
+        return any(row[1].lower() == column.lower() for row in cursor.fetchall())
+
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+    """, (table, column))
+    return cursor.fetchone()[0] > 0
+
+
+def has_index(cursor, table, index) -> bool:
+    if get_backend() == "sqlite":
+        cursor.execute(f"PRAGMA index_list({table})")
+        return any(row[1].lower() == index.lower() for row in cursor.fetchall())
+
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+    """, (table, index))
+    return cursor.fetchone()[0] > 0
+
+
+def table_size(cursor, table) -> int:
+    """Data + index size of table in bytes (SQLite without dbstat: whole file)"""
+    if get_backend() == "sqlite":
+        try:
+            cursor.execute("SELECT SUM(pgsize) FROM dbstat WHERE name = %s", (table,))
+            return int(cursor.fetchone()[0] or 0)
+        except sqlite3.OperationalError:
+            cursor.execute("PRAGMA page_count")
+            page_count = cursor.fetchone()[0]
+            cursor.execute("PRAGMA page_size")
+            return page_count * cursor.fetchone()[0]
+
+    cursor.execute(f"ANALYZE TABLE {table}")
+    cursor.fetchall()
+    cursor.execute("""
+        SELECT DATA_LENGTH + INDEX_LENGTH FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    """, (table,))
+    return int(cursor.fetchone()[0] or 0)
@@ -0,0 +1,89 @@
+import os
+import base64
+from functools import lru_cache
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateNumbers, RSAPublicNumbers
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from database.rsa import (PUBLIC_N, PUBLIC_E, PRIVATE_N, PRIVATE_D, PRIVATE_P, PRIVATE_Q, PRIVATE_DP,
+                          PRIVATE_DQ, PRIVATE_QINV, USE_CRT, decrypt_int, factor_modulus, crt_params)
+
+# Hybrid ciphertext format (replaces one RSA number per character):
+#   - each ApplicantProfile row gets a random AES-128 key, wrapped once with
+#     RSA-OAEP (SHA-256) and stored as "k1:" + base64 in the record_key column
+#   - each field is "h1:" + base64(nonce || AES-GCM ciphertext || tag),
+#     with the column name as associated data (fields cannot be swapped)
+# Record keys without the "k1:" prefix were wrapped with unpadded RSA; they
+# are still read, and migrate_ciphertext.py re-encrypts those rows.
+FORMAT_PREFIX = "h1:"
+KEY_PREFIX = "k1:"
+KEY_BYTES = 16
+NONCE_BYTES = 12
+OAEP = padding.OAEP(mgf=padding.MGF1(algorithm=hashes.SHA256()), algorithm=hashes.SHA256(), label=None)
+
+
+def is_hybrid(value) -> bool:
+    """True if value is a field in the hybrid format (False for per-character RSA)"""
+    return isinstance(value, str) and value.startswith(FORMAT_PREFIX)
+
+
+def new_record_key() -> bytes:
+    return AESGCM.generate_key(bit_length=KEY_BYTES * 8)
+
+
+def is_legacy_key(wrapped_key: str) -> bool:
+    """True for a record key wrapped with unpadded RSA (before RSA-OAEP)"""
+    return not wrapped_key.startswith(KEY_PREFIX)
+
+
+@lru_cache(maxsize=None)
+def _public_key():
+    return RSAPublicNumbers(PUBLIC_E, PUBLIC_N).public_key()
+
+@lru_cache(maxsize=None)
+def _private_key():
+    """Private key from .env (CRT values when present, else p and q recovered from d)"""
+    if USE_CRT:
+        p, q, dp, dq, qinv = PRIVATE_P, PRIVATE_Q, PRIVATE_DP, PRIVATE_DQ, PRIVATE_QINV
+    else:
+        p, q = factor_modulus(PRIVATE_N, PUBLIC_E, PRIVATE_D)
+        dp, dq, qinv = crt_params(p, q, PRIVATE_D)
+    return RSAPrivateNumbers(p, q, PRIVATE_D, dp, dq, qinv, RSAPublicNumbers(PUBLIC_E, PRIVATE_N)).private_key()
+
+
+def wrap_key(key: bytes) -> str:
+    """RSA-OAEP-encrypt a record key with the public key from .env -> "k1:" + base64"""
+    return KEY_PREFIX + base64.b64encode(_public_key().encrypt(key, OAEP)).decode("ascii")
+
+def unwrap_key(wrapped_key: str) -> bytes:
+    """Inverse of wrap_key (also reads legacy unpadded keys, one RSA private-key operation)"""
+    if is_legacy_key(wrapped_key):
+        key = decrypt_int(int.from_bytes(base64.b64decode(wrapped_key), "big"))
+        return key.to_bytes(KEY_BYTES, "big")
+    return _private_key().decrypt(base64.b64decode(wrapped_key[len(KEY_PREFIX):]), OAEP)
+
+
+def encrypt_field(plaintext: str, key: bytes, field: str) -> str:
+    nonce = os.urandom(NONCE_BYTES)
+    ciphertext = AESGCM(key).encrypt(nonce, plaintext.encode("utf-8"), field.encode("ascii"))
+    return FORMAT_PREFIX + base64.b64encode(nonce + ciphertext).decode("ascii")
+
+def decrypt_field(value: str, key: bytes, field: str) -> str:
+    raw = base64.b64decode(value[len(FORMAT_PREFIX):])
+    nonce, ciphertext = raw[:NONCE_BYTES], raw[NONCE_BYTES:]
+    return AESGCM(key).decrypt(nonce, ciphertext, field.encode("ascii")).decode("utf-8")
+
+
+def encrypt_record(fields: dict):
+    """
+    Encrypt the plaintext fields of one record under a fresh record key
+    Returns: (wrapped record key, dict field -> hybrid ciphertext)
+    """
+    key = new_record_key()
+    encrypted = {field: encrypt_field(value or "", key, field) for field, value in fields.items()}
+    return wrap_key(key), encrypted
+
+def decrypt_record(wrapped_key: str, fields: dict) -> dict:
+    """Decrypt hybrid fields of one record (dict field -> ciphertext)"""
+    key = unwrap_key(wrapped_key)
+    return {field: decrypt_field(value, key, field) for field, value in fields.items()}
@@ -1,10 +1,46 @@
-import os
-import mysql.connector
-from dotenv import load_dotenv
+from collections import OrderedDict
+from database import db
 from database.rsa import rsa_decrypt
+from database.hybrid import is_hybrid, unwrap_key, decrypt_field
 from datetime import datetime
 import time
 
+PROFILE_FIELDS = ("first_name", "last_name", "address", "phone_number", "date_of_birth")
+PROFILE_CACHE_SIZE = 256
+PROFILE_BATCH = 32  # applicant ids per profile query (fixed, so the prepared statement is reused)
+SEARCH_COLUMNS = ("detail_id", "applicant_id", "application_role", "cv_path")
+
+# ciphertext chunk -> character, shared by every decryption in this process
+_chunk_cache = {}
+# applicant_id -> decrypted profile (small LRU, used by lazy loading)
+_profile_cache = OrderedDict()
+
+
+def decrypt_profile(row_dict, chunk_cache=None):
+    """
+    Decrypt the profile fields of one applicantprofile row.
+    Accepts both the hybrid format (record_key column set, see database.hybrid)
+    and the legacy per-character RSA format, field by field.
+    Returns: dict of the decrypted PROFILE_FIELDS
+    """
+    if chunk_cache is None:
+        chunk_cache = _chunk_cache
+
+    record_key = None
+    if row_dict.get("record_key"):
+        record_key = unwrap_key(row_dict["record_key"])
+
+    decrypted = {}
+    for field in PROFILE_FIELDS:
+        value = row_dict[field]
+        if record_key is not None and is_hybrid(value):
+            decrypted[field] = decrypt_field(value, record_key, field)
+        else:
+            decrypted[field] = rsa_decrypt(value, chunk_cache)
+
+    decrypted["date_of_birth"] = datetime.strptime(decrypted["date_of_birth"], "%Y-%m-%d").date()
+    return decrypted
+
 
 def load_all_data():
     """
@@ -12,52 +48,29 @@ def load_all_data():
     Decrypts all data
     Returns: List of JSON (decrypted_data)
     """
-    load_dotenv()
-
-    conn = mysql.connector.connect(
-        host="localhost",
-        user=os.getenv("MYSQL_USER"),
-        password=os.getenv("MYSQL_PASSWORD"),
-        database="ats"
-    )
-    cursor = conn.cursor()
-
-    cursor.execute("""
-    SELECT * FROM applicantprofile NATURAL JOIN applicationdetail
-    """)
-
-    rows = cursor.fetchall()
-    columns = cursor.column_names
+    with db.query() as cursor:
+        cursor.execute("""
+        SELECT * FROM applicantprofile NATURAL JOIN applicationdetail
+        """)
+
+        rows = cursor.fetchall()
+        columns = cursor.column_names
     print("Decrypting loaded data...")
 
     start_time = time.time()
     decrypted_data = []
     cache = {}
+    chunk_cache = {}  # ciphertext chunk -> character (one pow() per distinct character)
 
     for idx, row in enumerate(rows):
         row_dict = dict(zip(columns, row))
         applicant_id = row_dict.get("applicant_id")
 
         if applicant_id in cache:
-            cached = cache[applicant_id]
-            row_dict.update({
-                "first_name": cached["first_name"],
-                "last_name": cached["last_name"],
-                "address": cached["address"],
-                "phone_number": cached["phone_number"],
-                "date_of_birth": cached["date_of_birth"],
-            })
+            row_dict.update(cache[applicant_id])
         else:
             try:
-                decrypted = {
-                    "first_name": rsa_decrypt(row_dict["first_name"]),
-                    "last_name": rsa_decrypt(row_dict["last_name"]),
-                    "address": rsa_decrypt(row_dict["address"]),
-                    "phone_number": rsa_decrypt(row_dict["phone_number"]),
-                }
-                dob_str = rsa_decrypt(row_dict["date_of_birth"])
-                decrypted["date_of_birth"] = datetime.strptime(dob_str, "%Y-%m-%d").date()
-
+                decrypted = decrypt_profile(row_dict, chunk_cache)
                 row_dict.update(decrypted)
                 cache[applicant_id] = decrypted
 
@@ -68,13 +81,237 @@ def load_all_data():
 
     end_time = time.time()
     elapsed = end_time - start_time
-    print(f"Decryption finished in {elapsed:.2f} seconds")
-
-    conn.commit() 
-    cursor.close()
-    conn.close()
+    print(f"Decryption finished in {elapsed:.2f} seconds "
+          f"({len(chunk_cache)} distinct ciphertext chunks decrypted)")
 
     return decrypted_data
 
+
+# ======================== LAZY LOADING ========================
+
+def filter_clause(filters):
+    """
+    WHERE clause for metadata filters on applicationdetail
+    filters: dict column -> value or list of values (columns from SEARCH_COLUMNS)
+    Returns: (sql, params), ("", []) without filters
+    """
+    conditions = []
+    params = []
+    for column, value in (filters or {}).items():
+        if column not in SEARCH_COLUMNS:
+            raise ValueError(f"Cannot filter on '{column}' (allowed: {', '.join(SEARCH_COLUMNS)})")
+        if isinstance(value, (list, tuple, set, frozenset)):
+            values = list(value)
+            conditions.append(f"{column} IN ({', '.join(['%s'] * len(values))})")
+            params.extend(values)
+        else:
+            conditions.append(f"{column} = %s")
+            params.append(value)
+
+    if not conditions:
+        return "", []
+    return "WHERE " + " AND ".join(conditions), params
+
+
+def load_search_data(filters=None):
+    """
+    Load only the columns needed for searching (no profile, no decryption).
+    Profiles are attached later with attach_profiles, for displayed CVs only.
+    filters (optional): metadata filters pushed into SQL, e.g. {"application_role": "Chef"}
+    Returns: List of JSON (detail_id, applicant_id, application_role, cv_path)
+    """
+    start_time = time.time()
+    where, params = filter_clause(filters)
+    with db.query() as cursor:
+        cursor.execute(f"""
+        SELECT detail_id, applicant_id, application_role, cv_path FROM applicationdetail
+        {where}
+        """, params)
+
+        columns = cursor.column_names
+        data = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    print(f"Loaded {len(data)} applications in {time.time() - start_time:.2f} seconds "
+          f"(profiles decrypted on demand)")
+    return data
+
+
+def load_profiles(applicant_ids):
+    """
+    Decrypted profiles of applicant_ids, served from the profile cache when possible
+    Returns: dict applicant_id -> decrypted profile
+    """
+    profiles = {}
+    missing = []
+    for applicant_id in dict.fromkeys(applicant_ids):
+        if applicant_id in _profile_cache:
+            _profile_cache.move_to_end(applicant_id)
+            profiles[applicant_id] = _profile_cache[applicant_id]
+        else:
+            missing.append(applicant_id)
+
+    if missing:
+        # SELECT * so record_key is read when the table has been migrated
+        statement = f"""
+            SELECT * FROM applicantprofile
+            WHERE applicant_id IN ({", ".join(["%s"] * PROFILE_BATCH)})
+            """
+        rows = []
+        with db.query(prepared=True) as cursor:
+            for start in range(0, len(missing), PROFILE_BATCH):
+                # Last batch padded with its last id: every batch runs the same prepared statement
+                batch = missing[start:start + PROFILE_BATCH]
+                cursor.execute(statement, batch + [batch[-1]] * (PROFILE_BATCH - len(batch)))
+                columns = cursor.column_names
+                rows.extend(cursor.fetchall())
+
+        for row in rows:
+            row_dict = dict(zip(columns, row))
+            applicant_id = row_dict["applicant_id"]
+            try:
+                profiles[applicant_id] = decrypt_profile(row_dict)
+            except Exception as e:
+                print(f"Decrypt failed for applicant_id={applicant_id}: {e}")
+                continue
+
+            _profile_cache[applicant_id] = profiles[applicant_id]
+            if len(_profile_cache) > PROFILE_CACHE_SIZE:
+                _profile_cache.popitem(last=False)
+
+    return profiles
+
+
+def attach_profiles(cvs):
+    """Fill the profile fields of cv dicts loaded by load_search_data (in place)"""
+    pending = [cv for cv in cvs if "first_name" not in cv and cv.get("applicant_id") is not None]
+    if not pending:
+        return cvs
+
+    profiles = load_profiles([cv["applicant_id"] for cv in pending])
+    for cv in pending:
+        profile = profiles.get(cv["applicant_id"])
+        if profile:
+            cv.update(profile)
+    return cvs
+
+
+
+# ======================== STREAMING ========================
+
+
+class ApplicationRow:
+    """
+    Compact applicationdetail row (slots instead of a dict per row).
+    Reads like the dicts of load_search_data (row['cv_path'], row.get(...),
+    'first_name' in row), so ATSProcessor, attach_profiles and SummaryPage
+    accept it unchanged. Profile fields are only held once attached, and
+    the dict is shared with the profile cache rather than copied.
+    """
+    __slots__ = SEARCH_COLUMNS + ("profile",)
+
+    def __init__(self, detail_id, applicant_id, application_role, cv_path):
+        self.detail_id = detail_id
+        self.applicant_id = applicant_id
+        self.application_role = application_role
+        self.cv_path = cv_path
+        self.profile = None
+
+    def __getitem__(self, key):
+        if key in SEARCH_COLUMNS:
+            return getattr(self, key)
+        if self.profile is not None and key in self.profile:
+            return self.profile[key]
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in SEARCH_COLUMNS or (self.profile is not None and key in self.profile)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def update(self, values):
+        """Attach profile fields (attach_profiles)"""
+        if self.profile is None:
+            self.profile = values
+        else:
+            self.profile = {**self.profile, **values}
+
+    def to_dict(self):
+        return {**{column: getattr(self, column) for column in SEARCH_COLUMNS}, **(self.profile or {})}
+
+    def __repr__(self):
+        return f"ApplicationRow({self.to_dict()!r})"
+
+
+class ApplicationStream:
+    """
+    Re-iterable stream of ApplicationRow. Every iteration runs the query on
+    an unbuffered cursor and reads batch_size rows at a time, so only one
+    batch is held in memory. ATSProcessor and InvertedIndex.update consume
+    it incrementally (the fuzzy stage iterates it a second time).
+    """
+
+    def __init__(self, batch_size=1000, filters=None):
+        self.batch_size = batch_size
+        self.filters = dict(filters or {})
+
+    def filter(self, filters):
+        """Stream of the rows matching filters as well (pushed into the SQL WHERE)"""
+        return ApplicationStream(self.batch_size, {**self.filters, **filters})
+
+    def __iter__(self):
+        with db.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                where, params = filter_clause(self.filters)
+                cursor.execute(f"""
+                SELECT {", ".join(SEARCH_COLUMNS)} FROM applicationdetail {where} ORDER BY detail_id
+                """, params)
+                while True:
+                    rows = cursor.fetchmany(self.batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield ApplicationRow(*row)
+            finally:
+                # Stopped early: drop the unread rows before the connection goes back to the pool
+                consume_results = getattr(conn, "consume_results", None)
+                if consume_results is not None:
+                    consume_results()
+                cursor.close()
+
+    def __len__(self):
+        """Number of applications (COUNT(*) on every call, rows may be added between iterations)"""
+        where, params = filter_clause(self.filters)
+        with db.query() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM applicationdetail {where}", params)
+            return cursor.fetchone()[0]
+
+
+def stream_applications(batch_size=1000, filters=None):
+    """Streaming alternative to load_search_data for very large applicant tables"""
+    return ApplicationStream(batch_size, filters)
+
+
+def load_roles():
+    """Distinct application roles (uses the application_role index)"""
+    with db.query() as cursor:
+        cursor.execute("""
+        SELECT DISTINCT application_role FROM applicationdetail
+        WHERE application_role IS NOT NULL ORDER BY application_role
+        """)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def load_cv_paths():
+    """Distinct cv_path of every application (for bulk text extraction)"""
+    with db.query() as cursor:
+        cursor.execute("SELECT DISTINCT cv_path FROM applicationdetail WHERE cv_path IS NOT NULL ORDER BY cv_path")
+        return [row[0] for row in cursor.fetchall()]
+
+
 if __name__ == "__main__":
     load_all_data()
@@ -0,0 +1,97 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from database import db
+from database.rsa import rsa_decrypt
+from database.hybrid import encrypt_record, decrypt_record, is_hybrid, is_legacy_key
+from database.loader import PROFILE_FIELDS, decrypt_profile
+
+
+def ensure_record_key_column(cursor):
+    """Add ApplicantProfile.record_key (wrapped per-record key) if missing"""
+    if not db.has_column(cursor, "ApplicantProfile", "record_key"):
+        cursor.execute("ALTER TABLE ApplicantProfile ADD COLUMN record_key TEXT DEFAULT NULL")
+        print("Column ApplicantProfile.record_key added.")
+
+
+def measure_load(cursor):
+    """Time to fetch and decrypt every profile -> (seconds, fetched bytes)"""
+    start_time = time.time()
+    cursor.execute("SELECT * FROM ApplicantProfile")
+    columns = cursor.column_names
+    rows = cursor.fetchall()
+    fetched = sum(len(value) for row in rows for value in row if isinstance(value, str))
+    chunk_cache = {}
+    for row in rows:
+        decrypt_profile(dict(zip(columns, row)), chunk_cache)
+    return time.time() - start_time, fetched
+
+
+def migrate(batch_size=200):
+    """
+    Re-encrypt every legacy (per-character RSA) ApplicantProfile row in the
+    hybrid format, batch by batch, as well as hybrid rows whose record key
+    was wrapped with unpadded RSA (they get a fresh, OAEP-wrapped key).
+    Rows already migrated are skipped, so the command can be re-run after
+    an interruption.
+    """
+    with db.connection() as conn:
+        with db.transaction(conn=conn) as cursor:
+            ensure_record_key_column(cursor)
+
+        with db.query(conn) as cursor:
+            size_before = db.table_size(cursor, "ApplicantProfile")
+            load_before, fetched_before = measure_load(cursor)
+
+            cursor.execute(f"SELECT applicant_id, record_key, {', '.join(PROFILE_FIELDS)} FROM ApplicantProfile")
+            rows = [row for row in cursor.fetchall() if row[1] is None or is_legacy_key(row[1])]
+        print(f"Migrating {len(rows)} profiles...")
+
+        _migrate_rows(conn, rows, batch_size)
+
+        with db.query(conn) as cursor:
+            size_after = db.table_size(cursor, "ApplicantProfile")
+            load_after, fetched_after = measure_load(cursor)
+
+    print(f"{'':<22} | {'before':>12} | {'after':>12}")
+    print(f"{'table size (bytes)':<22} | {size_before:>12} | {size_after:>12}")
+    print(f"{'fetched text (bytes)':<22} | {fetched_before:>12} | {fetched_after:>12}")
+    print(f"{'load + decrypt (s)':<22} | {load_before:>12.2f} | {load_after:>12.2f}")
+
+
+def _migrate_rows(conn, rows, batch_size):
+    """Re-encrypt (applicant_id, record_key, *PROFILE_FIELDS) rows, one transaction per batch"""
+    start_time = time.time()
+    chunk_cache = {}
+    migrated = 0
+    for batch_start in range(0, len(rows), batch_size):
+        updates = []
+        for applicant_id, old_key, *values in rows[batch_start:batch_start + batch_size]:
+            if old_key is not None:
+                # Hybrid row, record key wrapped without padding
+                plain = decrypt_record(old_key, dict(zip(PROFILE_FIELDS, values)))
+            else:
+                plain = {}
+                for field, value in zip(PROFILE_FIELDS, values):
+                    if is_hybrid(value):
+                        raise ValueError(f"applicant_id={applicant_id}: hybrid field without record_key")
+                    plain[field] = rsa_decrypt(value or "", chunk_cache)
+            record_key, encrypted = encrypt_record(plain)
+            updates.append((*(encrypted[field] for field in PROFILE_FIELDS), record_key, applicant_id))
+
+        with db.transaction(conn=conn) as cursor:
+            cursor.executemany(f"""
+                UPDATE ApplicantProfile
+                SET {', '.join(f'{field} = %s' for field in PROFILE_FIELDS)}, record_key = %s
+                WHERE applicant_id = %s
+            """, updates)
+        migrated += len(updates)
+        print(f"  {migrated}/{len(rows)}")
+
+    print(f"Migration finished in {time.time() - start_time:.2f} seconds")
+
+
+if __name__ == "__main__":
+    migrate()
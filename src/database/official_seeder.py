@@ -1,61 +1,75 @@
 import os
-import mysql.connector
-from dotenv import load_dotenv
-from rsa import rsa_encrypt
-
-def seed_data():
-    load_dotenv()
-
-    conn = mysql.connector.connect(
-        host="localhost",
-        user=os.getenv("MYSQL_USER"),
-        password=os.getenv("MYSQL_PASSWORD"),
-        database="ats"
-    )
-    cursor = conn.cursor()
-
-    with open("data/tubes3_seeding.sql", "r", encoding="utf-8") as f:
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from database import db
+from database.hybrid import encrypt_record
+from database.migrate_ciphertext import ensure_record_key_column
+from database.create_tables import create_indexes
+
+PROFILE_COLUMNS = ("first_name", "last_name", "date_of_birth", "address", "phone_number")
+
+def seed_data(sql_path="data/tubes3_seeding.sql", workers=None, batch_size=500):
+    """
+    Run the seeding SQL script, then encrypt every ApplicantProfile row.
+
+    Args:
+        - sql_path: MySQL script (split with db.split_sql, adapted for SQLite)
+        - workers: processes encrypting rows (default: CPU count, 1 = in process)
+        - batch_size: rows per encryption job / executemany
+    """
+    with open(sql_path, "r", encoding="utf-8") as f:
         sql_commands = f.read()
 
-    # Split commands
-    for command in sql_commands.split(";"):
-        command = command.strip()
-        if command:
-            try:
-                cursor.execute(command)
-            except mysql.connector.Error as err:
-                print(f"Failed executing: {command}\nError: {err}")
-
-    conn.commit()
-
-    cursor.execute("SELECT applicant_id, first_name, last_name, date_of_birth, address, phone_number FROM ApplicantProfile")
-    rows = cursor.fetchall()
-
-    for row in rows:
-        applicant_id, first_name, last_name, dob, address, phone = row
-
-        cursor.execute("""
-            UPDATE ApplicantProfile
-            SET first_name = %s,
-                last_name = %s,
-                date_of_birth = %s,
-                address = %s,
-                phone_number = %s
-            WHERE applicant_id = %s
-        """, (
-            rsa_encrypt(first_name or ""),
-            rsa_encrypt(last_name or ""),
-            rsa_encrypt(dob or ""),
-            rsa_encrypt(address or ""),
-            rsa_encrypt(phone or ""),
-            applicant_id
-        ))
-
-    conn.commit()
+    with db.connection() as conn:
+        with db.transaction(conn=conn) as cursor:
+            executed = db.execute_script(
+                cursor, sql_commands,
+                on_error=lambda command, err: print(f"Failed executing: {command}\nError: {err}"))
+            print(f"Executed {executed} statements from {sql_path}")
+
+            # Seeding script recreates the tables without the record key column and indexes
+            ensure_record_key_column(cursor)
+            create_indexes(cursor)
+
+        with db.query(conn) as cursor:
+            cursor.execute(f"SELECT applicant_id, {', '.join(PROFILE_COLUMNS)} FROM ApplicantProfile")
+            rows = cursor.fetchall()
+
+        start_time = time.time()
+        with db.transaction(conn=conn) as cursor:
+            for updates in encrypt_rows(rows, workers, batch_size):
+                cursor.executemany(f"""
+                    UPDATE ApplicantProfile
+                    SET {', '.join(f'{column} = %s' for column in PROFILE_COLUMNS)}, record_key = %s
+                    WHERE applicant_id = %s
+                """, updates)
+        print(f"Encrypted {len(rows)} profiles in {time.time() - start_time:.2f} seconds")
+
     print("✅ Database seeded and encrypted successfully.")
 
-    cursor.close()
-    conn.close()
+def _encrypt_batch(rows):
+    """Plaintext (applicant_id, *PROFILE_COLUMNS) rows -> UPDATE parameters (hybrid format)"""
+    updates = []
+    for applicant_id, *values in rows:
+        record_key, encrypted = encrypt_record(dict(zip(PROFILE_COLUMNS, values)))
+        updates.append((*(encrypted[column] for column in PROFILE_COLUMNS), record_key, applicant_id))
+    return updates
+
+def encrypt_rows(rows, workers=None, batch_size=500):
+    """Yield UPDATE parameter batches, encrypted across a process pool"""
+    batches = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+    workers = workers or os.cpu_count() or 1
+
+    if workers <= 1 or len(batches) <= 1:
+        for batch in batches:
+            yield _encrypt_batch(batch)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_encrypt_batch, batches)
 
 if __name__ == "__main__":
     seed_data()
@@ -10,6 +10,25 @@ PRIVATE_N = int(os.getenv("PRIVATE_N"))
 PRIVATE_D = int(os.getenv("PRIVATE_D"))
 
 
+def _optional_int(name):
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
+# Optional CRT key material (printed by generate_keypair). When present and
+# consistent with PRIVATE_N, decryption uses two half-size exponentiations.
+PRIVATE_P = _optional_int("PRIVATE_P")
+PRIVATE_Q = _optional_int("PRIVATE_Q")
+PRIVATE_DP = _optional_int("PRIVATE_DP")
+PRIVATE_DQ = _optional_int("PRIVATE_DQ")
+PRIVATE_QINV = _optional_int("PRIVATE_QINV")
+
+USE_CRT = (
+    None not in (PRIVATE_P, PRIVATE_Q, PRIVATE_DP, PRIVATE_DQ, PRIVATE_QINV)
+    and PRIVATE_P * PRIVATE_Q == PRIVATE_N
+)
+
+
 def rsa_encrypt(plaintext: str) -> str:
     """
     Encrypt plaintext string using RSA public key from .env
@@ -17,12 +36,39 @@ def rsa_encrypt(plaintext: str) -> str:
     """
     return ' '.join(str(pow(ord(char), PUBLIC_E, PUBLIC_N)) for char in plaintext)
 
-def rsa_decrypt(ciphertext: str) -> str:
+def decrypt_int(c: int) -> int:
+    """
+    RSA private-key operation c^d mod n.
+    Uses CRT (p, q, dP, dQ, qInv from .env) when available, else full pow().
+    """
+    if not USE_CRT:
+        return pow(c, PRIVATE_D, PRIVATE_N)
+
+    m1 = pow(c, PRIVATE_DP, PRIVATE_P)
+    m2 = pow(c, PRIVATE_DQ, PRIVATE_Q)
+    h = (PRIVATE_QINV * (m1 - m2)) % PRIVATE_P
+    return m2 + h * PRIVATE_Q
+
+def rsa_decrypt(ciphertext: str, chunk_cache: dict = None) -> str:
     """
     Decrypt space-separated string of encrypted integers using RSA private key from .env
     Returns original plaintext string
+
+    chunk_cache (optional): dict ciphertext chunk -> character, shared between calls.
+    rsa_encrypt is deterministic per character, so with a shared cache a whole
+    table needs one pow() per distinct character instead of one per character.
     """
-    return ''.join(chr(pow(int(chunk), PRIVATE_D, PRIVATE_N)) for chunk in ciphertext.split())
+    if chunk_cache is None:
+        return ''.join(chr(decrypt_int(int(chunk))) for chunk in ciphertext.split())
+
+    chars = []
+    for chunk in ciphertext.split():
+        char = chunk_cache.get(chunk)
+        if char is None:
+            char = chr(decrypt_int(int(chunk)))
+            chunk_cache[chunk] = char
+        chars.append(char)
+    return ''.join(chars)
 
 def is_prime(n, k=5):
     """Miller-Rabin primality test (probabilistic)"""
@@ -83,7 +129,47 @@ def generate_keypair(bits=512):
     print()
     print(f"PRIVATE_N={n}")
     print(f"PRIVATE_D={d}")
+    print_crt_params(p, q, d)
     print("\n==============================================")
 
+def crt_params(p, q, d):
+    """CRT key material: (dP, dQ, qInv)"""
+    return d % (p - 1), d % (q - 1), pow(q, -1, p)
+
+def print_crt_params(p, q, d):
+    """Print CRT key material as .env entries"""
+    dp, dq, qinv = crt_params(p, q, d)
+    print()
+    print(f"PRIVATE_P={p}")
+    print(f"PRIVATE_Q={q}")
+    print(f"PRIVATE_DP={dp}")
+    print(f"PRIVATE_DQ={dq}")
+    print(f"PRIVATE_QINV={qinv}")
+
+def factor_modulus(n, e, d):
+    """Recover (p, q) from an existing keypair (n, e, d), for keys made before CRT support"""
+    k = d * e - 1
+    t = 0
+    while k % 2 == 0:
+        k //= 2
+        t += 1
+
+    while True:
+        g = random.randrange(2, n - 1)
+        x = pow(g, k, n)
+        for _ in range(t):
+            y = pow(x, 2, n)
+            if y == 1 and x not in (1, n - 1):
+                p = gcd(x - 1, n)
+                return max(p, n // p), min(p, n // p)
+            x = y
+
 if __name__ == "__main__":
-    generate_keypair()
+    import sys
+    if "--crt" in sys.argv:
+        # Print CRT entries for the keypair already in .env
+        p, q = factor_modulus(PRIVATE_N, PUBLIC_E, PRIVATE_D)
+        print("=== ADD THE FOLLOWING TO YOUR .env FILE ===")
+        print_crt_params(p, q, PRIVATE_D)
+    else:
+        generate_keypair()
@@ -1,130 +1,217 @@
-import os 
-import re 
-import random 
-from faker import Faker 
-import mysql.connector 
-from dotenv import load_dotenv 
- 
-fake = Faker("id_ID") 
- 
-def seed_data(data_dir='data', limit_per_role=20, max_cvs_per_applicant=5): 
-    load_dotenv() 
- 
-    conn = mysql.connector.connect( 
-        host="localhost", 
-        user=os.getenv("MYSQL_USER"), 
-        password=os.getenv("MYSQL_PASSWORD"), 
-        database="ats" 
-    ) 
-    cursor = conn.cursor() 
- 
+import os
+import re
+import sys
+import time
+import random
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from faker import Faker
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from database import db
+from utils.cli import positive_int
+
+fake = Faker("id_ID")
+
+PROFILE_CHUNK = 10_000  # profiles generated per worker job
+
+def seed_data(data_dir='data', limit_per_role=20, max_cvs_per_applicant=5,
+              num_applicants=None, num_applications=None, workers=None, batch_size=5000, seed=None):
+    """
+    Seed random applicants and assign the CVs of data_dir to them.
+
+    Args:
+        - data_dir, limit_per_role: CVs taken from data/<ROLE>/*.pdf
+        - max_cvs_per_applicant: soft cap on CVs per applicant
+        - num_applicants: default 30-80% of the number of applications
+        - num_applications: default one per CV; larger values reuse the CVs
+          round-robin (load-test databases with millions of rows)
+        - workers: processes generating fake profiles (default: CPU count)
+        - batch_size: rows per executemany
+        - seed: seed for reproducible databases
+    """
+    rng = random.Random(seed)
+
     # Collect all PDFs from all roles
     all_cvs = []
-    for role in os.listdir(data_dir): 
-        role_path = os.path.join(data_dir, role) 
-        if not os.path.isdir(role_path): 
-            continue 
- 
-        pdf_files = [os.path.join(role_path, f) for f in os.listdir(role_path) if f.lower().endswith(".pdf")] 
+    for role in sorted(os.listdir(data_dir)):
+        role_path = os.path.join(data_dir, role)
+        if not os.path.isdir(role_path):
+            continue
+
+        pdf_files = [os.path.join(role_path, f) for f in os.listdir(role_path) if f.lower().endswith(".pdf")]
         pdf_files.sort()
-        pdf_files = pdf_files[:limit_per_role] 
-        
+        pdf_files = pdf_files[:limit_per_role]
+
         for pdf_file in pdf_files:
-            all_cvs.append({'role': role, 'cv_path': pdf_file})
-    
-    total_cvs = len(all_cvs)
-    if total_cvs == 0:
+            all_cvs.append((role, pdf_file))
+
+    if not all_cvs:
         print("No PDF files found!")
         return
-    
+
     # Shuffle CVs
-    random.shuffle(all_cvs)
-    
+    rng.shuffle(all_cvs)
+    total_cvs = max(1, num_applications or len(all_cvs))
+
     # Random number of applicants
-    applicant_ratio = random.uniform(0.3, 0.8)
-    num_applicants = max(1, int(total_cvs * applicant_ratio))
-    
+    if num_applicants is None:
+        applicant_ratio = rng.uniform(0.3, 0.8)
+        num_applicants = max(1, int(total_cvs * applicant_ratio))
+    num_applicants = max(1, min(num_applicants, total_cvs))
+
     print(f"Create {num_applicants} applicants for {total_cvs} CVs")
-    
-    # Create applicants and distribute CVs
-    applicant_ids = []
-    cv_assignments = []  # Tuples: (applicant_index, cv_data)
-    
-    # Create all applicants
-    for i in range(num_applicants):
-        first_name = fake.first_name() 
-        last_name = fake.last_name() 
-        dob = fake.date_of_birth(minimum_age=20, maximum_age=50).strftime("%Y-%m-%d") 
-        address = fake.address().replace("\n", ", ") 
-        raw_phone = fake.phone_number() 
-        phone = re.sub(r'\D', '', raw_phone)[:20] 
- 
-        cursor.execute(""" 
-            INSERT INTO ApplicantProfile (first_name, last_name, date_of_birth, address, phone_number) 
-            VALUES (%s, %s, %s, %s, %s) 
-        """, (first_name, last_name, dob, address, phone)) 
- 
-        applicant_ids.append(cursor.lastrowid)
-    
-    # Distribute CVs
-    cv_index = 0
-    # At least 1 CV / applicant
-    for applicant_idx in range(num_applicants):
-        if cv_index < total_cvs:
-            cv_assignments.append((applicant_idx, all_cvs[cv_index]))
-            cv_index += 1
-    
-    # Distribute remaining CVs randomly
-    while cv_index < total_cvs:
-        applicant_idx = random.randint(0, num_applicants - 1)
-        
-        # Check too many CVs
-        current_cv_count = sum(1 for a_idx, _ in cv_assignments if a_idx == applicant_idx)
-        if current_cv_count < max_cvs_per_applicant:
-            cv_assignments.append((applicant_idx, all_cvs[cv_index]))
-            cv_index += 1
-        else:
-            # Find fewer CVs
-            applicant_cv_counts = {}
-            for a_idx, _ in cv_assignments:
-                applicant_cv_counts[a_idx] = applicant_cv_counts.get(a_idx, 0) + 1
-            
-            # Find applicant with minimum CVs
-            min_cvs = min(applicant_cv_counts.values())
-            candidates = [a_idx for a_idx in range(num_applicants) 
-                         if applicant_cv_counts.get(a_idx, 0) == min_cvs]
-            
-            selected_applicant = random.choice(candidates)
-            cv_assignments.append((selected_applicant, all_cvs[cv_index]))
-            cv_index += 1
-    
-    # Insert application details
-    for applicant_idx, cv_data in cv_assignments:
-        applicant_id = applicant_ids[applicant_idx]
-        
-        cursor.execute(""" 
-            INSERT INTO ApplicationDetail (applicant_id, application_role, cv_path) 
-            VALUES (%s, %s, %s) 
-        """, (applicant_id, cv_data['role'], cv_data['cv_path']))
-    
-    conn.commit() 
-    cursor.close() 
-    conn.close() 
-    
+    start_time = time.time()
+
+    assignments = assign_cvs(num_applicants, total_cvs, max_cvs_per_applicant, rng)
+
+    with db.transaction() as cursor:
+        cursor.execute("SELECT COALESCE(MAX(applicant_id), 0) FROM ApplicantProfile")
+        first_id = cursor.fetchone()[0] + 1
+
+        # Create all applicants (explicit ids, so executemany needs no lastrowid)
+        inserted = 0
+        for profiles in generate_profiles(first_id, num_applicants, workers, rng.getrandbits(32)):
+            for batch_start in range(0, len(profiles), batch_size):
+                cursor.executemany("""
+                    INSERT INTO ApplicantProfile (applicant_id, first_name, last_name, date_of_birth, address, phone_number)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                """, profiles[batch_start:batch_start + batch_size])
+            inserted += len(profiles)
+            print(f"  {inserted}/{num_applicants} applicants")
+
+        # Insert application details
+        batch = []
+        for cv_index, applicant_idx in enumerate(assignments):
+            role, cv_path = all_cvs[cv_index % len(all_cvs)]
+            batch.append((first_id + applicant_idx, role, cv_path))
+            if len(batch) >= batch_size:
+                _insert_details(cursor, batch)
+                batch = []
+        if batch:
+            _insert_details(cursor, batch)
+
     # Stats
-    applicant_cv_counts = {}
-    for applicant_idx, _ in cv_assignments:
-        applicant_cv_counts[applicant_idx] = applicant_cv_counts.get(applicant_idx, 0) + 1
-    
-    min_cvs = min(applicant_cv_counts.values())
-    max_cvs = max(applicant_cv_counts.values())
-    avg_cvs = len(cv_assignments) / len(applicant_ids)
-    
+    applicant_cv_counts = [0] * num_applicants
+    for applicant_idx in assignments:
+        applicant_cv_counts[applicant_idx] += 1
+
+    min_cvs = min(applicant_cv_counts)
+    max_cvs = max(applicant_cv_counts)
+    avg_cvs = len(assignments) / num_applicants
+    elapsed = time.time() - start_time
+
     print(f"Seeding completed successfully!")
-    print(f"Created {len(applicant_ids)} applicants")
-    print(f"Assigned {len(cv_assignments)} CV applications")
+    print(f"Created {num_applicants} applicants")
+    print(f"Assigned {len(assignments)} CV applications")
     print(f"CVs per applicant - Min: {min_cvs}, Max: {max_cvs}, Avg: {avg_cvs:.1f}")
-    print(f"All {total_cvs} CVs have been assigned to applicants")
- 
-if __name__ == "__main__": 
-    seed_data()
\ No newline at end of file
+    print(f"Finished in {elapsed:.2f} seconds ({(num_applicants + len(assignments)) / max(elapsed, 1e-9):.0f} rows/s)")
+
+def _insert_details(cursor, rows):
+    cursor.executemany("""
+        INSERT INTO ApplicationDetail (applicant_id, application_role, cv_path)
+        VALUES (%s, %s, %s)
+    """, rows)
+
+# ======================== CV ASSIGNMENT ========================
+
+def assign_cvs(num_applicants, num_cvs, max_cvs_per_applicant, rng=random):
+    """
+    Applicant index of every CV. Every applicant gets one CV first,
+    remaining CVs go to a random
+    applicant, or to a random least-loaded applicant when that one
+    already has max_cvs_per_applicant. Each step is O(1): applicants
+    are kept in buckets by CV count (swap-remove) and the minimum count
+    only grows.
+
+    Returns: list of applicant indexes (index i = CV i)
+    """
+    if num_cvs <= 0:
+        return []
+    num_applicants = max(1, min(num_applicants, num_cvs))
+    assignments = list(range(num_applicants))
+
+    counts = [1] * num_applicants
+    by_count = {1: list(range(num_applicants))}
+    position = list(range(num_applicants))  # position of each applicant in its bucket
+    min_count = 1
+
+    for _ in range(num_cvs - num_applicants):
+        applicant_idx = rng.randrange(num_applicants)
+        if counts[applicant_idx] >= max_cvs_per_applicant:
+            # Find applicant with minimum CVs
+            while not by_count.get(min_count):
+                min_count += 1
+            candidates = by_count[min_count]
+            applicant_idx = candidates[rng.randrange(len(candidates))]
+
+        # Move applicant_idx from bucket count to bucket count + 1
+        count = counts[applicant_idx]
+        bucket = by_count[count]
+        last = bucket[-1]
+        bucket[position[applicant_idx]] = last
+        position[last] = position[applicant_idx]
+        bucket.pop()
+
+        next_bucket = by_count.setdefault(count + 1, [])
+        position[applicant_idx] = len(next_bucket)
+        next_bucket.append(applicant_idx)
+        counts[applicant_idx] = count + 1
+
+        assignments.append(applicant_idx)
+
+    return assignments
+
+# ======================== PROFILE GENERATION ========================
+
+def _generate_chunk(job):
+    """Fake profiles (applicant_id, first, last, dob, address, phone) for one id range"""
+    first_id, count, seed = job
+    fake.seed_instance(seed)
+    profiles = []
+    for applicant_id in range(first_id, first_id + count):
+        first_name = fake.first_name()
+        last_name = fake.last_name()
+        dob = fake.date_of_birth(minimum_age=20, maximum_age=50).strftime("%Y-%m-%d")
+        address = fake.address().replace("\n", ", ")
+        raw_phone = fake.phone_number()
+        phone = re.sub(r'\D', '', raw_phone)[:20]
+        profiles.append((applicant_id, first_name, last_name, dob, address, phone))
+    return profiles
+
+def generate_profiles(first_id, count, workers=None, seed=0):
+    """
+    Yield lists of fake profiles in id order, PROFILE_CHUNK at a time,
+    generated across worker processes (Faker dominates seeding time)
+    """
+    jobs = [(start, min(PROFILE_CHUNK, first_id + count - start), seed + start)
+            for start in range(first_id, first_id + count, PROFILE_CHUNK)]
+    workers = workers or os.cpu_count() or 1
+
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield _generate_chunk(job)
+        return
+
+    # At most 2 chunks per worker in flight, so memory stays bounded for 1M+ applicants
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for job in jobs:
+            pending.append(pool.submit(_generate_chunk, job))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed random applicants for the CVs in data/")
+    parser.add_argument("--applicants", type=positive_int, default=None, help="number of applicants")
+    parser.add_argument("--applications", type=positive_int, default=None, help="number of applications (CVs reused)")
+    parser.add_argument("--workers", type=positive_int, default=None, help="profile generator processes")
+    parser.add_argument("--batch-size", type=positive_int, default=5000, help="rows per executemany")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    args = parser.parse_args()
+
+    seed_data(num_applicants=args.applicants, num_applications=args.applications,
+              workers=args.workers, batch_size=args.batch_size, seed=args.seed)
@@ -0,0 +1,218 @@
+import os
+import mmap
+import struct
+import bisect
+from typing import Iterable, Optional, Tuple
+
+DEFAULT_CORPUS_PATH = os.path.join(".cache", "corpus.bin")
+
+MAGIC = b"ATSCORP1"
+# magic, doc count, slot count, offset of the tables, backend name
+HEADER = struct.Struct("<8sQQQ16s")
+SLOT_FIELDS = 4  # offset, length (bytes of the text), size, mtime_ns (of the PDF)
+
+
+class CorpusFile:
+    """
+    Read-only corpus of normalized CV texts in a single file, opened
+    with mmap (nothing is read until a document is used).
+
+    Layout (little-endian, int64):
+        header
+        text blob:  UTF-8 texts back to back
+        detail_ids: doc_count ids, sorted (ApplicationDetail.detail_id)
+        doc_slots:  doc_count slot numbers (CVs shared by several
+                    applications are stored once)
+        slots:      slot_count x (offset, length, size, mtime_ns)
+
+    The tables are memoryviews over the mapping, lookup is a binary
+    search over detail_ids and a document is a zero-copy slice of the
+    blob, decoded only when its text is needed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = memoryview(self._mmap)
+        magic, doc_count, slot_count, tables_offset, backend = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            view.release()
+            self._mmap.close()
+            raise ValueError(f"{path} is not a corpus file")
+
+        self.backend = backend.rstrip(b"\0").decode("ascii")
+        self.doc_count = doc_count
+        self.slot_count = slot_count
+
+        ids_end = tables_offset + doc_count * 8
+        slots_start = ids_end + doc_count * 8
+        self._view = view
+        self._blob = view[HEADER.size:tables_offset]  # (may end with alignment padding)
+        self._detail_ids = view[tables_offset:ids_end].cast("q")
+        self._doc_slots = view[ids_end:slots_start].cast("q")
+        self._slots = view[slots_start:slots_start + slot_count * SLOT_FIELDS * 8].cast("q")
+
+        self.hits = 0
+        self.stale = 0
+
+    @classmethod
+    def open(cls, path: str = DEFAULT_CORPUS_PATH) -> Optional["CorpusFile"]:
+        """Open the corpus at path, or None if it is missing or unreadable"""
+        if not os.path.exists(path):
+            print(f"Corpus file '{path}' not found (build it with src/ingest.py --corpus)")
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Corpus file unreadable, ignoring it: {e}")
+            return None
+
+    def close(self):
+        for view in (self._detail_ids, self._doc_slots, self._slots, self._blob, self._view):
+            view.release()
+        self._mmap.close()
+
+    def __len__(self) -> int:
+        return self.doc_count
+
+    def __contains__(self, detail_id) -> bool:
+        return self._slot_of(detail_id) is not None
+
+    # ======================== LOOKUP ========================
+
+    def _slot_of(self, detail_id) -> Optional[int]:
+        position = bisect.bisect_left(self._detail_ids, detail_id)
+        if position < self.doc_count and self._detail_ids[position] == detail_id:
+            return self._doc_slots[position]
+        return None
+
+    def view(self, detail_id, cv_path: Optional[str] = None) -> Optional[memoryview]:
+        """
+        Zero-copy slice (UTF-8 bytes) of the text of detail_id.
+
+        Args:
+            detail_id: ApplicationDetail.detail_id
+            cv_path: when given, the PDF is stat()-ed and a file changed
+                since the corpus was built is treated as missing
+
+        Returns:
+            memoryview or None (not in the corpus, or stale)
+        """
+        slot = self._slot_of(detail_id)
+        if slot is None:
+            return None
+
+        base = slot * SLOT_FIELDS
+        offset, length, size, mtime_ns = self._slots[base:base + SLOT_FIELDS]
+        if cv_path is not None:
+            try:
+                stat = os.stat(cv_path)
+            except OSError:
+                stat = None
+            if stat is None or stat.st_size != size or stat.st_mtime_ns != mtime_ns:
+                self.stale += 1
+                return None
+
+        self.hits += 1
+        return self._blob[offset:offset + length]
+
+    def text(self, detail_id, cv_path: Optional[str] = None) -> Optional[str]:
+        """Text of detail_id (decoded from the mapping), None if missing or stale"""
+        view = self.view(detail_id, cv_path)
+        return None if view is None else str(view, "utf-8")
+
+    def reset_stats(self):
+        self.hits = 0
+        self.stale = 0
+
+    def stats(self) -> dict:
+        """hits: texts read from the corpus, stale: PDFs changed since it was built"""
+        return {"hits": self.hits, "stale": self.stale}
+
+    def merge_stats(self, stats: dict):
+        """Add the counters of a worker process"""
+        self.hits += stats["hits"]
+        self.stale += stats["stale"]
+
+    def print_stats(self):
+        print(f"Corpus file: {self.hits} texts read, {self.stale} stale (read from the text cache)")
+
+
+# ======================== BUILD ========================
+
+def write_corpus(path: str, documents: Iterable[Tuple[int, str, str, Tuple[int, int]]], backend: str = "") -> dict:
+    """
+    Write a corpus file (atomic replace). Texts are streamed to disk,
+    only the tables are kept in memory.
+
+    Args:
+        path: output file
+        documents: (detail_id, cv_path, text, (size, mtime_ns) of the PDF)
+        backend: PDF backend the texts were extracted with
+
+    Returns:
+        dict: documents, slots (distinct CVs), bytes
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    doc_slots = {}      # detail_id -> slot
+    slot_of_path = {}   # abspath -> slot
+    slots = []          # (offset, length, size, mtime_ns)
+    offset = 0
+
+    with open(tmp_path, "wb") as f:
+        f.write(b"\0" * HEADER.size)
+
+        for detail_id, cv_path, text, file_stat in documents:
+            key = os.path.abspath(cv_path)
+            slot = slot_of_path.get(key)
+            if slot is None:
+                data = text.encode("utf-8")
+                f.write(data)
+                slot = len(slots)
+                slots.append((offset, len(data), file_stat[0], file_stat[1]))
+                slot_of_path[key] = slot
+                offset += len(data)
+            doc_slots[int(detail_id)] = slot
+
+        # Align the int64 tables
+        padding = -offset % 8
+        f.write(b"\0" * padding)
+        tables_offset = HEADER.size + offset + padding
+        detail_ids = sorted(doc_slots)
+        f.write(struct.pack(f"<{len(detail_ids)}q", *detail_ids))
+        f.write(struct.pack(f"<{len(detail_ids)}q", *(doc_slots[d] for d in detail_ids)))
+        f.write(struct.pack(f"<{len(slots) * SLOT_FIELDS}q", *(value for slot in slots for value in slot)))
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, len(detail_ids), len(slots), tables_offset, backend.encode("ascii")[:16]))
+
+    os.replace(tmp_path, path)
+    return {"documents": len(detail_ids), "slots": len(slots), "bytes": os.path.getsize(path)}
+
+
+def build_corpus(path: str, cv_dataset, text_cache) -> dict:
+    """
+    Corpus of every row of cv_dataset (with 'detail_id' and 'cv_path'),
+    texts taken from text_cache (extracted on a miss). Missing PDFs are left
+    out, as are PDFs whose text the cache does not hold (quarantined or
+    failed): they are read through the text cache, which retries them.
+    """
+    def documents():
+        for cv in cv_dataset:
+            cv_path = cv['cv_path']
+            try:
+                stat = os.stat(cv_path)
+            except OSError:
+                continue
+            text = text_cache.get(cv_path)
+            if not text_cache.is_cached(cv_path):
+                continue
+            yield cv['detail_id'], cv_path, text, (stat.st_size, stat.st_mtime_ns)
+
+    stats = write_corpus(path, documents(), getattr(text_cache, "backend", ""))
+    text_cache.flush()
+    return stats
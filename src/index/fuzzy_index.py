@@ -0,0 +1,192 @@
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+from algorithm.fuzzy import FuzzyMatcher
+from index.inverted_index import InvertedIndex
+
+
+class FuzzyIndex:
+    """
+    Fuzzy index over the corpus vocabulary, derived from an InvertedIndex.
+
+    FuzzyMatcher.fuzzy_search compares a single-word keyword with every word
+    of a CV (punctuation removed). Here every distinct word of the corpus is
+    compared once per query instead, then mapped back to the CVs containing
+    it through postings.
+
+    Candidate words come from a SymSpell-style deletion neighbourhood: words
+    short enough that the threshold allows at most max_deletes edits are
+    stored under every string reachable by deleting up to max_deletes
+    characters; a keyword is expanded the same way and looked up. Longer
+    words (where the threshold allows more edits, and deletion
+    neighbourhoods explode) go through a bigram count filter: two words
+    within edit distance d share at least max_len - 1 - 2d bigrams, so
+    candidates are the words reaching that count in the bigram -> words
+    lookup. Only when that bound is <= 0 (thresholds around 0.5 and
+    below) is a length bucket scanned. Every candidate is verified with
+    the banded Levenshtein, so results are identical to fuzzy_search.
+    """
+
+    def __init__(self, inverted_index: InvertedIndex, matcher: FuzzyMatcher, max_deletes: int = 2):
+        self.inverted_index = inverted_index
+        self.matcher = matcher
+        self.max_deletes = max_deletes
+
+        self.version = None
+        self.words = {}                     # word -> {doc id: first token position}
+        self.by_length = defaultdict(list)  # len(word) -> [words]
+        self.deletes = defaultdict(list)    # deletion variant -> [words]
+        self.delete_max_len = 0             # words up to this length are in self.deletes
+        self.bigrams = defaultdict(list)    # bigram -> [(word, occurrences in word)]
+
+    # ======================== BUILD ========================
+
+    @staticmethod
+    def strip_punctuation(term: str) -> str:
+        """Same cleaning as FuzzyMatcher.get_ngrams, applied to one token"""
+        return re.sub(r'[^\w\s]', '', term)
+
+    @staticmethod
+    def deletion_variants(word: str, depth: int) -> set:
+        """All strings obtained by deleting up to depth characters (word included)"""
+        variants = {word}
+        frontier = {word}
+        for _ in range(depth):
+            next_frontier = set()
+            for variant in frontier:
+                for i in range(len(variant)):
+                    next_frontier.add(variant[:i] + variant[i + 1:])
+            next_frontier -= variants
+            variants |= next_frontier
+            frontier = next_frontier
+        return variants
+
+    def refresh(self) -> bool:
+        """Rebuild if the inverted index changed since the last build"""
+        if self.version == self.inverted_index.version:
+            return False
+
+        words = defaultdict(dict)
+        for term, term_postings in self.inverted_index.postings.items():
+            word = self.strip_punctuation(term)
+            if not word:
+                continue
+            doc_positions = words[word]
+            for doc_id, positions in term_postings.items():
+                first = positions[0]
+                if first < doc_positions.get(doc_id, first + 1):
+                    doc_positions[doc_id] = first
+
+        # Longest word length at which the threshold still allows <= max_deletes edits
+        delete_max_len = 0
+        while self.matcher.max_distance_for(self.matcher.threshold, delete_max_len + 1) <= self.max_deletes:
+            delete_max_len += 1
+            if delete_max_len > 64:
+                break
+
+        self.words = dict(words)
+        self.by_length = defaultdict(list)
+        self.deletes = defaultdict(list)
+        self.delete_max_len = delete_max_len
+        self.bigrams = defaultdict(list)
+        for word in self.words:
+            self.by_length[len(word)].append(word)
+            for bigram, occurrences in self.word_bigrams(word).items():
+                self.bigrams[bigram].append((word, occurrences))
+            if len(word) <= delete_max_len:
+                for variant in self.deletion_variants(word, self.max_deletes):
+                    self.deletes[variant].append(word)
+
+        self.version = self.inverted_index.version
+        return True
+
+    @staticmethod
+    def word_bigrams(word: str) -> Counter:
+        return Counter(word[i:i + 2] for i in range(len(word) - 1))
+
+    # ======================== QUERY ========================
+
+    @staticmethod
+    def supports(keyword: str) -> bool:
+        """Only single-word keywords are answered from the index"""
+        return len(keyword.split()) == 1 and ' ' not in keyword
+
+    def similar_words(self, keyword: str, threshold=None) -> List[Tuple[float, str]]:
+        """Vocabulary words with similarity >= threshold, as (similarity, word)"""
+        if threshold is None:
+            threshold = self.matcher.threshold
+
+        keyword_len = len(keyword)
+        if keyword_len == 0:
+            return []
+
+        candidates = set()
+        use_deletes = False
+        min_shared = {}  # word length -> bigrams a match must share with keyword
+        for length, bucket in self.by_length.items():
+            max_len = max(keyword_len, length)
+            if 1 - (abs(keyword_len - length) / max_len) < threshold:
+                continue
+            if max_len <= self.delete_max_len:
+                use_deletes = True
+                continue
+            needed = max_len - 1 - 2 * self.matcher.max_distance_for(threshold, max_len)
+            if needed > 0:
+                min_shared[length] = needed
+            else:
+                # Count filter says nothing at this length
+                candidates.update(bucket)
+
+        if min_shared:
+            shared = defaultdict(int)
+            for bigram, occurrences in self.word_bigrams(keyword).items():
+                for word, word_occurrences in self.bigrams.get(bigram, ()):
+                    if len(word) in min_shared:
+                        shared[word] += min(occurrences, word_occurrences)
+            for word, count in shared.items():
+                if count >= min_shared[len(word)]:
+                    candidates.add(word)
+
+        if use_deletes:
+            for variant in self.deletion_variants(keyword, self.max_deletes):
+                for word in self.deletes.get(variant, ()):
+                    if max(keyword_len, len(word)) <= self.delete_max_len:
+                        candidates.add(word)
+
+        similar = []
+        for word in candidates:
+            similarity = self.matcher.cached_similarity(keyword, word, threshold)
+            if similarity >= threshold:
+                similar.append((similarity, word))
+        return similar
+
+    def search(self, keyword: str, threshold=None) -> Dict[str, List[Tuple[float, str]]]:
+        """
+        Fuzzy matches of a single-word keyword for every indexed CV
+
+        Returns:
+            dict: cv_path -> list of (similarity, word), in the same order as
+            FuzzyMatcher.fuzzy_search (similarity desc, then first occurrence)
+        """
+        self.refresh()
+
+        per_doc = defaultdict(list)
+        for similarity, word in self.similar_words(keyword, threshold):
+            for doc_id, first_position in self.words[word].items():
+                per_doc[doc_id].append((similarity, first_position, word))
+
+        doc_paths = self.inverted_index.doc_paths
+        result = {}
+        for doc_id, matches in per_doc.items():
+            matches.sort(key=lambda m: (-m[0], m[1]))
+            result[doc_paths[doc_id]] = [(similarity, word) for similarity, _, word in matches]
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "words": len(self.words),
+            "delete_keys": len(self.deletes),
+            "delete_max_len": self.delete_max_len,
+            "bigrams": len(self.bigrams),
+        }
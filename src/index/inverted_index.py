@@ -0,0 +1,302 @@
+import os
+import re
+import pickle
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+DEFAULT_INDEX_PATH = os.path.join(".cache", "inverted_index.pkl")
+GRAM = 3  # n of the n-gram -> term lookup used for substring queries
+
+
+def partition_path(path: str, partition: str) -> str:
+    """Path of a partition of the index at path, e.g. inverted_index.chef.pkl"""
+    base, ext = os.path.splitext(path)
+    slug = re.sub(r'[^a-z0-9]+', '-', str(partition).lower()).strip('-') or "none"
+    return f"{base}.{slug}{ext}"
+
+
+class InvertedIndex:
+    """
+    Inverted token index over the normalized CV text
+    (output of extract_pdf_for_string_matching).
+
+    The normalized text is lowercase with single spaces, so it is exactly
+    ' '.join(tokens). That lets every keyword be answered from postings with
+    the same counts as KMP/Aho-Corasick (overlapping substring matches):
+
+    - single word: every vocabulary term containing the keyword, weighted by
+      the number of occurrences inside the term
+    - phrase: a term ending with the first word, exact middle words, and a
+      term starting with the last word, at consecutive positions
+
+    Terms containing a keyword are found through a trigram -> terms lookup
+    (intersection of the keyword's trigrams), not by scanning the
+    vocabulary. Keywords shorter than 3 characters still scan it.
+    """
+
+    def __init__(self):
+        self.doc_ids = {}       # cv_path -> doc id
+        self.doc_paths = []     # doc id -> cv_path
+        self.doc_stats = []     # doc id -> (size, mtime_ns) of the PDF, None if missing
+        self.doc_lengths = []   # doc id -> number of tokens
+        self.doc_terms = []     # doc id -> set of terms (for removal)
+        self.postings = {}      # term -> {doc id: [positions]}
+        self.version = 0        # bumped on every change (for derived indexes)
+        self.backend = "pypdf2" # PDF backend the texts were extracted with
+        self._grams = None      # trigram -> set of terms (built on first query, not pickled)
+
+    # ======================== BUILD ========================
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Split normalized text into tokens (positions = list index)"""
+        return text.split(' ') if text else []
+
+    @staticmethod
+    def _file_stat(cv_path: str):
+        try:
+            stat = os.stat(cv_path)
+            return (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            return None
+
+    def add_document(self, cv_path: str, text: str, file_stat=None) -> int:
+        """Index (or re-index) one document, returns its doc id"""
+        doc_id = self.doc_ids.get(cv_path)
+        if doc_id is None:
+            doc_id = len(self.doc_paths)
+            self.doc_ids[cv_path] = doc_id
+            self.doc_paths.append(cv_path)
+            self.doc_stats.append(None)
+            self.doc_lengths.append(0)
+            self.doc_terms.append(set())
+        else:
+            self._remove_postings(doc_id)
+
+        positions = defaultdict(list)
+        tokens = self.tokenize(text)
+        for pos, term in enumerate(tokens):
+            positions[term].append(pos)
+
+        for term, term_positions in positions.items():
+            term_postings = self.postings.get(term)
+            if term_postings is None:
+                term_postings = self.postings[term] = {}
+                self._add_grams(term)
+            term_postings[doc_id] = term_positions
+
+        self.doc_stats[doc_id] = file_stat
+        self.doc_lengths[doc_id] = len(tokens)
+        self.doc_terms[doc_id] = set(positions)
+        self.version += 1
+        return doc_id
+
+    def _remove_postings(self, doc_id: int):
+        for term in self.doc_terms[doc_id]:
+            term_postings = self.postings.get(term)
+            if term_postings is None:
+                continue
+            term_postings.pop(doc_id, None)
+            if not term_postings:
+                del self.postings[term]
+                self._remove_grams(term)
+        self.doc_terms[doc_id] = set()
+        self.doc_lengths[doc_id] = 0
+        self.version += 1
+
+    def update(self, cv_dataset, text_cache) -> int:
+        """
+        Index every cv_path of cv_dataset that is new or whose PDF changed,
+        and every empty document whose text was unavailable (quarantined or
+        failed in the text cache) and can now be extracted.
+
+        Args:
+            cv_dataset: rows with 'cv_path'
+            text_cache: TextCache used to get the normalized text
+
+        Returns:
+            int: number of documents (re-)indexed
+        """
+        backend = getattr(text_cache, "backend", self.backend)
+        if backend != self.backend:
+            # Texts of another PDF backend may tokenize differently: start over
+            version = self.version
+            self.__init__()
+            self.version = version + 1
+            self.backend = backend
+
+        indexed = 0
+        for cv in cv_dataset:
+            cv_path = cv['cv_path']
+            file_stat = self._file_stat(cv_path)
+            doc_id = self.doc_ids.get(cv_path)
+
+            if doc_id is not None and file_stat is not None and self.doc_stats[doc_id] == file_stat:
+                # An empty document whose text the cache does not hold (quarantined
+                # or failed extraction) is checked again, it may have been re-admitted
+                if self.doc_lengths[doc_id] or text_cache.is_cached(cv_path):
+                    continue
+
+            text = text_cache.get(cv_path)
+            if not text and doc_id is not None and self.doc_lengths[doc_id] == 0:
+                continue  # still empty
+
+            self.add_document(cv_path, text, file_stat)
+            indexed += 1
+
+        return indexed
+
+    # ======================== QUERY ========================
+
+    def document_length(self, cv_path: str) -> int:
+        """Number of tokens of cv_path (0 if empty or not indexed)"""
+        doc_id = self.doc_ids.get(cv_path)
+        return self.doc_lengths[doc_id] if doc_id is not None else 0
+
+    @staticmethod
+    def _count_in_term(term: str, keyword: str) -> int:
+        """Overlapping occurrences of keyword inside term"""
+        count = 0
+        i = term.find(keyword)
+        while i != -1:
+            count += 1
+            i = term.find(keyword, i + 1)
+        return count
+
+    def count(self, keyword: str) -> Dict[str, int]:
+        """
+        Exact match count of keyword per document
+
+        Returns:
+            dict: cv_path -> count (only documents with count > 0)
+        """
+        if not keyword:
+            return {}
+
+        parts = keyword.split(' ')
+        if len(parts) == 1:
+            counts = self._count_word(keyword)
+        else:
+            counts = self._count_phrase(parts)
+
+        return {self.doc_paths[doc_id]: count for doc_id, count in counts.items() if count > 0}
+
+    def _count_word(self, keyword: str) -> Dict[int, int]:
+        counts = defaultdict(int)
+        for term in self.terms_containing(keyword):
+            occurrences = self._count_in_term(term, keyword)
+            for doc_id, positions in self.postings[term].items():
+                counts[doc_id] += occurrences * len(positions)
+        return counts
+
+    def _positions_of(self, terms: Iterable[str]) -> Dict[int, set]:
+        """doc id -> positions of every term of terms"""
+        result = defaultdict(set)
+        for term in terms:
+            for doc_id, positions in self.postings[term].items():
+                result[doc_id].update(positions)
+        return result
+
+    def _count_phrase(self, parts: List[str]) -> Dict[int, int]:
+        first, middle, last = parts[0], parts[1:-1], parts[-1]
+
+        middle_postings = []
+        for term in middle:
+            term_postings = self.postings.get(term)
+            if not term_postings:
+                return {}
+            middle_postings.append(term_postings)
+
+        first_positions = self._positions_of(term for term in self.terms_containing(first) if term.endswith(first))
+        last_positions = self._positions_of(term for term in self.terms_containing(last) if term.startswith(last))
+
+        candidates = set(first_positions) & set(last_positions)
+        for term_postings in middle_postings:
+            candidates &= set(term_postings)
+
+        counts = {}
+        span = len(parts) - 1
+        for doc_id in candidates:
+            middle_sets = [set(term_postings[doc_id]) for term_postings in middle_postings]
+            doc_last = last_positions[doc_id]
+            count = 0
+            for start in first_positions[doc_id]:
+                if start + span not in doc_last:
+                    continue
+                if all(start + 1 + j in positions for j, positions in enumerate(middle_sets)):
+                    count += 1
+            counts[doc_id] = count
+        return counts
+
+    # ======================== TRIGRAM LOOKUP ========================
+
+    @staticmethod
+    def _term_grams(term: str) -> set:
+        return {term[i:i + GRAM] for i in range(len(term) - GRAM + 1)}
+
+    def _add_grams(self, term: str):
+        if self._grams is not None:
+            for gram in self._term_grams(term):
+                self._grams.setdefault(gram, set()).add(term)
+
+    def _remove_grams(self, term: str):
+        if self._grams is not None:
+            for gram in self._term_grams(term):
+                terms = self._grams.get(gram)
+                if terms is not None:
+                    terms.discard(term)
+                    if not terms:
+                        del self._grams[gram]
+
+    def terms_containing(self, keyword: str) -> List[str]:
+        """Vocabulary terms containing keyword as a substring"""
+        if len(keyword) < GRAM:
+            # Too short for a trigram: linear scan of the vocabulary
+            return [term for term in self.postings if keyword in term]
+
+        if self._grams is None:
+            self._grams = {}
+            for term in self.postings:
+                self._add_grams(term)
+
+        candidates = None
+        for gram in sorted(self._term_grams(keyword), key=lambda gram: len(self._grams.get(gram, ()))):
+            terms = self._grams.get(gram)
+            if not terms:
+                return []
+            candidates = set(terms) if candidates is None else candidates & terms
+        # Sharing every trigram is necessary, not sufficient
+        return [term for term in candidates if keyword in term]
+
+    # ======================== PERSISTENCE ========================
+
+    def save(self, path: str = DEFAULT_INDEX_PATH):
+        """Pickle the index to path (atomic replace)"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            state = dict(self.__dict__, _grams=None)
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX_PATH) -> "InvertedIndex":
+        """Load a pickled index, or return an empty one"""
+        index = cls()
+        if not os.path.exists(path):
+            return index
+
+        try:
+            with open(path, "rb") as f:
+                index.__dict__.update(pickle.load(f))
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            print(f"Inverted index unreadable, rebuilding: {e}")
+            index = cls()
+        return index
+
+    def stats(self) -> dict:
+        return {
+            "documents": sum(1 for stat in self.doc_stats if stat is not None),
+            "terms": len(self.postings),
+            "tokens": sum(self.doc_lengths),
+        }
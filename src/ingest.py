@@ -0,0 +1,255 @@
+import os
+import glob
+import json
+import time
+import signal
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from utils import pdf_backends
+from utils.cli import positive_int
+from utils.text_cache import TextCache, DEFAULT_CACHE_DIR
+from index.corpus_file import DEFAULT_CORPUS_PATH, build_corpus
+
+CHECKPOINT_NAME = "ingest_checkpoint.json"
+RETRY = "extraction process failed"  # not checkpointed, the file is tried again next run
+
+
+def data_cv_paths(data_dir="data"):
+    """Every data/<ROLE>/*.pdf"""
+    return sorted(glob.glob(os.path.join(data_dir, "*", "*.pdf")))
+
+
+def database_cv_paths():
+    """Distinct cv_path of ApplicationDetail"""
+    from database import loader
+    return loader.load_cv_paths()
+
+
+# ======================== CHECKPOINT ========================
+
+def load_checkpoint(path):
+    """Failures of previous runs: abspath -> {size, mtime_ns, reason}"""
+    if not os.path.exists(path):
+        return {"failed": {}}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ingest checkpoint unreadable, starting fresh: {e}")
+        return {"failed": {}}
+
+
+def save_checkpoint(path, checkpoint, cache):
+    """
+    Persist progress: the text cache index (finished files) and the
+    failure list, both replaced atomically.
+    """
+    cache.flush()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def _is_known_failure(checkpoint, cv_path, cache):
+    """
+    Failed before and unchanged since (a changed file is tried again, as
+    is a quarantined or failed file once the cache retries it)
+    """
+    failure = checkpoint["failed"].get(os.path.abspath(cv_path))
+    if failure is None:
+        return False
+    if failure["reason"].startswith("quarantined: "):
+        return cache.is_quarantined(cv_path)
+    if failure["reason"].startswith("failed: "):
+        return cache.is_failed(cv_path)
+    try:
+        stat = os.stat(cv_path)
+    except OSError:
+        return True
+    return failure["size"] == stat.st_size and failure["mtime_ns"] == stat.st_mtime_ns
+
+
+# ======================== WORKER ========================
+
+_worker_cache = None
+
+
+def _init_worker(cache_dir, backend):
+    global _worker_cache
+    pdf_backends.configure(backend)
+    _worker_cache = TextCache(cache_dir, backend=backend)
+
+
+def _init_pool_worker(cache_dir, backend):
+    """Pool initializer: Ctrl+C is handled by the parent (which checkpoints)"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _init_worker(cache_dir, backend)
+
+
+def _ingest_file(cv_path):
+    """
+    Extract one CV into the text cache
+    -> (cv_path, index entry or None, (size, mtime_ns) or None, error)
+    """
+    try:
+        stat = os.stat(cv_path)
+        text = _worker_cache.get(cv_path)
+    except Exception as e:
+        return cv_path, None, None, str(e)
+
+    file_stat = (stat.st_size, stat.st_mtime_ns)
+    if _worker_cache.is_quarantined(cv_path, stat):
+        # Over the extraction budget, no index entry (persist the quarantine entry right away, it is rare)
+        _worker_cache.flush()
+        return cv_path, None, file_stat, "quarantined: " + _worker_cache.quarantine[os.path.abspath(cv_path)]["reason"]
+    if _worker_cache.is_failed(cv_path, stat):
+        # The PDF library failed on it, no index entry
+        _worker_cache.flush()
+        return cv_path, None, file_stat, "failed: " + _worker_cache.failures[os.path.abspath(cv_path)]["reason"]
+
+    if not _worker_cache.is_cached(cv_path):
+        # Extraction process failed, nothing stored: not a failure of the file
+        return cv_path, None, None, RETRY
+    entry = _worker_cache.entry(cv_path)
+    if not text:
+        return cv_path, entry, file_stat, "no text extracted"
+    return cv_path, entry, file_stat, None
+
+
+# ======================== INGEST ========================
+
+def ingest(cv_paths, cache_dir=DEFAULT_CACHE_DIR, workers=None, checkpoint_every=200):
+    """
+    Extract and normalize every CV of cv_paths into the text cache
+    (the corpus store read by ATSProcessor), across worker processes.
+
+    Files already cached and unchanged are skipped, as are files that
+    failed in a previous run and have not changed since, so an
+    interrupted run resumes where it stopped. Progress is checkpointed
+    every checkpoint_every files and on exit (also on Ctrl+C).
+
+    Args:
+        - cv_paths: PDF paths (duplicates are ingested once)
+        - cache_dir: TextCache directory
+        - workers: extraction processes (default: CPU count)
+        - checkpoint_every: files between checkpoints (at least 1)
+
+    Returns:
+        dict: total, skipped, extracted, failed, seconds, files_per_sec
+    """
+    checkpoint_every = max(1, checkpoint_every)
+    backend = pdf_backends.backend_name()
+    cache = TextCache(cache_dir, backend=backend)
+    checkpoint_path = os.path.join(cache_dir, CHECKPOINT_NAME)
+    checkpoint = load_checkpoint(checkpoint_path)
+
+    cv_paths = list(dict.fromkeys(cv_paths))
+    pending = [path for path in cv_paths
+               if not cache.is_cached(path) and not _is_known_failure(checkpoint, path, cache)]
+    skipped = len(cv_paths) - len(pending)
+    workers = workers or os.cpu_count() or 1
+
+    print(f"Ingest: {len(cv_paths)} CVs, {skipped} already done, {len(pending)} to extract "
+          f"({backend}, {workers} workers)")
+
+    extracted = 0
+    failed = 0
+    start = time.perf_counter()
+
+    def handle(result):
+        nonlocal extracted, failed
+        cv_path, entry, file_stat, error = result
+        key = os.path.abspath(cv_path)
+        if entry is not None:
+            cache.record(key, entry)
+        if error is None:
+            extracted += 1
+            checkpoint["failed"].pop(key, None)
+        elif error == RETRY:
+            failed += 1
+        else:
+            failed += 1
+            checkpoint["failed"][key] = {
+                "size": file_stat[0] if file_stat else -1,
+                "mtime_ns": file_stat[1] if file_stat else -1,
+                "reason": error,
+            }
+
+        done = extracted + failed
+        if done % checkpoint_every == 0:
+            save_checkpoint(checkpoint_path, checkpoint, cache)
+            elapsed = time.perf_counter() - start
+            print(f"  {done}/{len(pending)} files, {done / max(elapsed, 1e-9):.1f} files/s, {failed} failed")
+
+    try:
+        if workers <= 1 or len(pending) <= 1:
+            _init_worker(cache_dir, backend)
+            for path in pending:
+                handle(_ingest_file(path))
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                       initializer=_init_pool_worker, initargs=(cache_dir, backend))
+            try:
+                chunksize = max(1, min(32, len(pending) // (workers * 8)))
+                for result in pool.map(_ingest_file, pending, chunksize=chunksize):
+                    handle(result)
+            finally:
+                # Do not wait for queued files when interrupted
+                pool.shutdown(wait=False, cancel_futures=True)
+    except KeyboardInterrupt:
+        print("Interrupted, saving checkpoint (run again to resume)")
+    finally:
+        save_checkpoint(checkpoint_path, checkpoint, cache)
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        "total": len(cv_paths),
+        "skipped": skipped,
+        "extracted": extracted,
+        "failed": failed,
+        "seconds": elapsed,
+        "files_per_sec": (extracted + failed) / elapsed if elapsed else 0.0,
+    }
+
+    print(f"Ingested {extracted} CVs in {elapsed:.2f} seconds ({stats['files_per_sec']:.1f} files/s), "
+          f"{skipped} skipped, {failed} failed")
+    failures = checkpoint["failed"]
+    if failures:
+        print(f"Failed files ({len(failures)}, skipped until they change):")
+        for path, failure in list(failures.items())[:20]:
+            print(f"  {path}: {failure['reason']}")
+        if len(failures) > 20:
+            print(f"  ... and {len(failures) - 20} more (see {checkpoint_path})")
+
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-extract CV texts into the text cache")
+    parser.add_argument("--source", choices=("data", "db"), default="data",
+                        help="data/ tree or ApplicationDetail.cv_path")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--workers", type=positive_int, default=None, help="extraction processes")
+    parser.add_argument("--checkpoint-every", type=positive_int, default=200, help="files between checkpoints")
+    parser.add_argument("--backend", default=None, help="PDF backend (default ATS_PDF_BACKEND)")
+    parser.add_argument("--corpus", nargs="?", const=DEFAULT_CORPUS_PATH, default=None,
+                        help=f"then write the memory-mapped corpus file (default {DEFAULT_CORPUS_PATH}, needs --source db)")
+    args = parser.parse_args()
+    if args.corpus and args.source != "db":
+        parser.error("--corpus needs --source db (documents are keyed by detail_id)")
+
+    pdf_backends.configure(args.backend)
+    paths = database_cv_paths() if args.source == "db" else data_cv_paths(args.data_dir)
+    ingest(paths, args.cache_dir, args.workers, args.checkpoint_every)
+
+    if args.corpus:
+        from database import loader
+        start = time.perf_counter()
+        stats = build_corpus(args.corpus, loader.load_search_data(), TextCache(args.cache_dir))
+        print(f"Corpus {args.corpus}: {stats['documents']} applications, {stats['slots']} CVs, "
+              f"{stats['bytes'] / 1e6:.1f} MB in {time.perf_counter() - start:.2f} seconds")
@@ -8,8 +8,11 @@ from summary_page import SummaryPage
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from ats_processor import ATSProcessor
+from index.corpus_file import DEFAULT_CORPUS_PATH
 from database import loader
 
+ALL_ROLES = "All roles"
+
 class GUI:
     def __init__(self, page: ft.Page):
         # ============================ PAGE UI =============================
@@ -23,10 +26,26 @@ class GUI:
         self.page.scroll = ft.ScrollMode.ADAPTIVE 
 
         # =================== ATS Processor ===================
-        self.processor = ATSProcessor(fuzzy_threshold=0.65)
+        # ATS_WORKERS > 1 shards the search across worker processes
+        # ATS_USE_INDEX=1 answers exact matches from the inverted index
+        # ATS_CORPUS=1 reads texts from the memory-mapped corpus file (src/ingest.py --source db --corpus)
+        self.processor = ATSProcessor(
+            fuzzy_threshold=0.65,
+            workers=int(os.getenv("ATS_WORKERS", "1")),
+            use_index=os.getenv("ATS_USE_INDEX", "0") == "1",
+            corpus_path=DEFAULT_CORPUS_PATH if os.getenv("ATS_CORPUS", "0") == "1" else None,
+        )
 
         # =================== Load DB ===================
-        self.cv_dataset = loader.load_all_data()
+        # ATS_LAZY_PROFILES=1 only loads what searching needs; profiles are
+        # decrypted for displayed cards / summary page (ATS_LAZY_PROFILES=0: all at startup)
+        # ATS_STREAMING=1 streams rows in batches on every search instead of keeping them in memory
+        if os.getenv("ATS_STREAMING", "0") == "1":
+            self.cv_dataset = loader.stream_applications(int(os.getenv("ATS_STREAM_BATCH", "1000")))
+        elif os.getenv("ATS_LAZY_PROFILES", "1") == "1":
+            self.cv_dataset = loader.load_search_data()
+        else:
+            self.cv_dataset = loader.load_all_data()
 
         # ==================== KEYWORDS INPUT =======================
         self.keywords_input = ft.TextField(
@@ -63,6 +82,26 @@ class GUI:
             text_style=ft.TextStyle(color="#4a4441"),
         )
 
+        # ==================== ROLE FILTER =======================
+        # Filter applied before any PDF is read (pushed into SQL for streamed datasets)
+        if isinstance(self.cv_dataset, list):
+            roles = sorted({cv.get('application_role') for cv in self.cv_dataset if cv.get('application_role')})
+        else:
+            roles = loader.load_roles()
+        self.role_input = ft.Dropdown(
+            label="Role",
+            value=ALL_ROLES,
+            options=[ft.dropdown.Option(ALL_ROLES)] + [ft.dropdown.Option(role) for role in roles],
+            width=220,
+            filled=True,
+            bgcolor=ft.Colors.WHITE,
+            border_radius=ft.border_radius.all(8),
+            border_color="#4a4441",
+
+            label_style=ft.TextStyle(color="#4a4441"),
+            text_style=ft.TextStyle(color="#4a4441"),
+        )
+
         # ==================== SEARCH =======================
         self.search_button = ft.ElevatedButton(
             text="Search",
@@ -176,16 +215,39 @@ class GUI:
             # self.populate_dummy_grid()
             return
 
+        filters = None
+        if self.role_input.value and self.role_input.value != ALL_ROLES:
+            filters = {'application_role': self.role_input.value}
+        scanned = len(self.processor.filter_dataset(self.cv_dataset, filters))
+
         # Top results
         top_results, exact_match_time, fuzzy_match_time = self.processor.get_top_search_results(
-            top_n, keywords_str, self.cv_dataset)
+            top_n, keywords_str, self.cv_dataset, filters)
 
         # Display the results
         self.search_status.value = f"Found {len(top_results)} relevant CVs.\n"
-        self.search_status.value += f"Exact Match: {len(self.cv_dataset)} CVs scanned in {exact_match_time}ms.\n"
+        self.search_status.value += f"Exact Match: {scanned} CVs scanned in {exact_match_time}ms.\n"
         
         if (fuzzy_match_time > 0):
-            self.search_status.value += f"Fuzzy Match: {len(self.cv_dataset)} CVs scanned in {fuzzy_match_time}ms."
+            self.search_status.value += f"Fuzzy Match: {scanned} CVs scanned in {fuzzy_match_time}ms."
+
+        # PDFs over the extraction budget (ATS_EXTRACT_TIMEOUT / ATS_EXTRACT_MAX_MB)
+        cache_stats = self.processor.text_cache.stats()
+        if cache_stats['quarantined'] or cache_stats['newly_quarantined']:
+            self.search_status.value += (f"\nQuarantine: {cache_stats['quarantined']} CVs skipped "
+                                         f"(~{cache_stats['time_saved']:.1f}s saved), "
+                                         f"{cache_stats['newly_quarantined']} newly quarantined.")
+
+        # PDFs changed since the corpus file was built (rebuild with src/ingest.py --corpus)
+        if self.processor.corpus is not None and self.processor.corpus.stale:
+            self.search_status.value += (f"\nCorpus file: {self.processor.corpus.stale} CVs changed since it was built, "
+                                         f"read from the text cache.")
+
+        # Decrypt profiles of the displayed CVs only (no-op if already loaded)
+        loader.attach_profiles([result['data'] for result in top_results])
+        for result in top_results:
+            if not result['name']:
+                result['name'] = ATSProcessor.display_name(result['data'])
 
         if not top_results:
             self.results_grid.controls.append(ft.Container(
@@ -300,7 +362,7 @@ class GUI:
                 horizontal_alignment=ft.CrossAxisAlignment.CENTER,
                 controls=[
                     ft.Text("ATS with Pattern Matching", size=32, weight=ft.FontWeight.BOLD, color="#4a4441"),
-                    ft.Row([self.keywords_input, self.top_matches_input], vertical_alignment=ft.CrossAxisAlignment.END),
+                    ft.Row([self.keywords_input, self.role_input, self.top_matches_input], vertical_alignment=ft.CrossAxisAlignment.END),
                     ft.Row([
                         ft.Text("Search Algorithm:", weight=ft.FontWeight.BOLD, size=14, color="#4a4441"), 
                         self.search_algo_buttons],
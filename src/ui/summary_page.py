@@ -5,7 +5,7 @@ import re
 from typing import Dict, List, Any
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from utils.extract_pdf_regex import extract_pdf_to_regex_string
+from database import loader
 
 
 class SummaryPage:
@@ -15,6 +15,10 @@ class SummaryPage:
         self.main_gui = main_gui_instance
         self.cv_sections = None
 
+        # Lazily loaded datasets carry no profile yet
+        if self.applicant_data:
+            loader.attach_profiles([self.applicant_data])
+
         # Store the current page state before clearing
         self.previous_controls = self.page.controls.copy()
 
@@ -22,11 +26,13 @@ class SummaryPage:
         self.show_summary_page()
 
     def load_cv_sections(self):
-        """Load CV sections from PDF using extract_pdf_regex"""
+        """Load CV sections from the text cache (stored by the extraction of the search)"""
         if self.applicant_data and self.applicant_data.get('cv_path'):
             try:
                 cv_path = self.applicant_data['cv_path']
-                self.cv_sections = extract_pdf_to_regex_string(cv_path)
+                text_cache = self.main_gui.processor.text_cache
+                self.cv_sections = text_cache.get_sections(cv_path)
+                text_cache.flush()
                 print(f"Successfully loaded CV sections for: {cv_path}")
             except Exception as e:
                 print(f"Error extracting CV sections: {e}")
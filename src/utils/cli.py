@@ -0,0 +1,9 @@
+import argparse
+
+
+def positive_int(value):
+    """argparse type: integer >= 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
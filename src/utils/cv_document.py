@@ -0,0 +1,21 @@
+from typing import Tuple
+
+from utils import extract_pdf_match, extract_pdf_regex
+
+
+def extract_texts(cv_path: str) -> Tuple[str, str]:
+    """
+    Parse satu CV PDF sekali saja dan turunkan dua view-nya (TextCache extractor):
+    - match_text: string satu baris lowercase untuk string matching
+      (sama dengan extract_pdf_for_string_matching)
+    - summary_text: text yang mempertahankan baris untuk
+      _extract_cv_sections (sama dengan extract_pdf_for_summary)
+
+    Args:
+        cv_path (str): Path to the PDF file
+
+    Returns:
+        (match_text, summary_text)
+    """
+    raw_text = extract_pdf_match.extract_text_from_pdf(cv_path, strict=True)
+    return extract_pdf_match._clean_text(raw_text), extract_pdf_regex._clean_text(raw_text)
@@ -1,7 +1,7 @@
 import os
 import re
 from typing import Optional
-import PyPDF2
+from utils import pdf_backends
 
 def extract_pdf_for_string_matching(cv_path: str) -> str:
     """
@@ -53,15 +53,28 @@ def find_pdf_file(pdf_filename: str) -> Optional[str]:
     return None
 
 
-def extract_text_from_pdf(cv_path: str) -> str:
+def extract_text_from_pdf(cv_path: str, strict: bool = False) -> str:
     """
-    Extract text content from the PDF file.
+    Extract text content from the PDF file with the configured backend
+    (ATS_PDF_BACKEND, see utils.pdf_backends).
+
+    Extraction runs under the per-file budget of pdf_backends.get_budget():
+    a file over the size budget is not parsed, and the PDF is parsed in a
+    child process that is killed when the time budget runs out (even in
+    the middle of a page).
     
     Args:
         pdf_path (str): Full path to the PDF file
+        strict (bool): raise ExtractionFailed instead of returning "" when
+            the PDF library fails (an empty PDF still returns "")
     
     Returns:
         str: Extracted text content
+
+    Raises:
+        ExtractionBudgetExceeded: the file went over the time or size budget
+        ExtractionProcessError: the extraction process failed (not the PDF)
+        ExtractionFailed: the PDF library failed (strict only)
     """
 
     # Search the PDF file
@@ -74,23 +87,30 @@ def extract_text_from_pdf(cv_path: str) -> str:
     # print(f"Found PDF: {pdf_path}")
     
     extracted_text = ""
+    max_seconds, max_bytes = pdf_backends.get_budget()
 
     try:
-        with open(cv_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                page_text = page.extract_text()
-                if page_text:
-                    extracted_text += page_text + "\n"
-            
-            if extracted_text.strip():
-                print(f"Successfully extracted text ({len(pdf_reader.pages)} pages)")
-                return extracted_text
+        size = os.path.getsize(cv_path)
+        if max_bytes and size > max_bytes:
+            raise pdf_backends.ExtractionBudgetExceeded(
+                cv_path, f"file is {size / 1048576:.1f} MB (budget {max_bytes / 1048576:.3g} MB)", limit="size")
+
+        pages = pdf_backends.extract_pages_within(cv_path, max_seconds)
+        page_count = len(pages)
+        for page_text in pages:
+            if page_text:
+                extracted_text += page_text + "\n"
+        
+        if extracted_text.strip():
+            print(f"Successfully extracted text ({page_count} pages)")
+            return extracted_text
     
+    except (pdf_backends.ExtractionBudgetExceeded, pdf_backends.ExtractionProcessError):
+        raise
     except Exception as e:
         print(f"Error: {str(e)}")
+        if strict:
+            raise pdf_backends.ExtractionFailed(cv_path, f"{type(e).__name__}: {e}")
     
     if (extracted_text == ""):
         print(f"This pdf file is empty: {cv_path}")
@@ -0,0 +1,296 @@
+import abc
+import os
+import time
+import importlib
+from functools import lru_cache
+from importlib import metadata
+import signal
+import multiprocessing
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_BACKEND = "pypdf2"
+DEFAULT_TIME_BUDGET = 10.0  # seconds per file (ATS_EXTRACT_TIMEOUT, 0 = no limit)
+DEFAULT_SIZE_BUDGET = 20.0  # MB per file (ATS_EXTRACT_MAX_MB, 0 = no limit)
+
+
+class ExtractionBudgetExceeded(Exception):
+    """A PDF went over the per-file time or size budget (it is quarantined by TextCache)"""
+
+    def __init__(self, cv_path: str, reason: str, seconds: float = 0.0, limit: str = "time"):
+        super().__init__(f"{cv_path}: {reason}")
+        self.cv_path = cv_path
+        self.reason = reason
+        self.seconds = seconds
+        self.limit = limit  # "time" or "size"
+
+
+class ExtractionFailed(Exception):
+    """The PDF library could not extract cv_path (TextCache records it instead of caching empty text)"""
+
+    def __init__(self, cv_path: str, reason: str):
+        super().__init__(f"{cv_path}: {reason}")
+        self.cv_path = cv_path
+        self.reason = reason
+
+
+class ExtractionProcessError(Exception):
+    """The extraction child process failed (did not start, or died): says nothing about the PDF, which is retried"""
+
+
+class PDFExtractor(abc.ABC):
+    """
+    Interface backend ekstraksi text PDF.
+
+    Subclass mengimplementasikan iter_pages(); library-nya di-import
+    saat pertama dipakai, jadi backend yang tidak dipilih tidak perlu
+    ter-install.
+    """
+
+    name = ""
+    module = ""        # library imported by iter_pages
+    distribution = ""  # package providing it (its version is recorded with extraction failures)
+
+    @abc.abstractmethod
+    def iter_pages(self, cv_path: str) -> Iterator[str]:
+        """
+        Yield the text of every page (empty string for pages without text),
+        one page at a time so callers can stop between pages.
+
+        Args:
+            cv_path (str): Full path to the PDF file
+        """
+
+    def extract_pages(self, cv_path: str) -> List[str]:
+        """Text of every page as a list"""
+        return list(self.iter_pages(cv_path))
+
+
+class PyPDF2Extractor(PDFExtractor):
+    name = "pypdf2"
+    module = "PyPDF2"
+    distribution = "PyPDF2"
+
+    def iter_pages(self, cv_path: str) -> Iterator[str]:
+        import PyPDF2
+
+        with open(cv_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            for page in pdf_reader.pages:
+                yield page.extract_text() or ""
+
+
+class PdfiumExtractor(PDFExtractor):
+    name = "pypdfium2"
+    module = "pypdfium2"
+    distribution = "pypdfium2"
+
+    def iter_pages(self, cv_path: str) -> Iterator[str]:
+        import pypdfium2
+
+        pdf = pypdfium2.PdfDocument(cv_path)
+        try:
+            for page in pdf:
+                text_page = page.get_textpage()
+                # pdfium ends lines with \r\n
+                text = text_page.get_text_range().replace("\r\n", "\n").replace("\r", "\n")
+                text_page.close()
+                page.close()
+                yield text
+        finally:
+            pdf.close()
+
+
+class PdfminerExtractor(PDFExtractor):
+    name = "pdfminer"
+    module = "pdfminer.high_level"
+    distribution = "pdfminer.six"
+
+    def iter_pages(self, cv_path: str) -> Iterator[str]:
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer
+
+        for layout in extract_pages(cv_path):
+            yield "".join(element.get_text() for element in layout
+                          if isinstance(element, LTTextContainer))
+
+
+BACKENDS: Dict[str, type] = {
+    PyPDF2Extractor.name: PyPDF2Extractor,
+    PdfiumExtractor.name: PdfiumExtractor,
+    PdfminerExtractor.name: PdfminerExtractor,
+}
+
+_extractor: Optional[PDFExtractor] = None
+_budget: Optional[Tuple[float, int]] = None
+
+
+def configure(backend: Optional[str] = None) -> PDFExtractor:
+    """
+    Select the extraction backend: the argument, else ATS_PDF_BACKEND,
+    else pypdf2. Unknown names fall back to pypdf2.
+    """
+    global _extractor
+    name = (backend or os.getenv("ATS_PDF_BACKEND", DEFAULT_BACKEND)).lower()
+    if name not in BACKENDS:
+        print(f"PDF backend '{name}' not recognized. Defaulting to {DEFAULT_BACKEND}.")
+        name = DEFAULT_BACKEND
+    _extractor = BACKENDS[name]()
+    return _extractor
+
+
+def get_extractor() -> PDFExtractor:
+    """Configured extractor (configure() on first use)"""
+    return _extractor if _extractor is not None else configure()
+
+
+def backend_name() -> str:
+    return get_extractor().name
+
+
+@lru_cache(maxsize=None)
+def library_version(backend: str) -> Optional[str]:
+    """Installed version of the library behind backend, None if it is not installed"""
+    try:
+        return metadata.version(BACKENDS[backend].distribution)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def configure_budget(max_seconds: Optional[float] = None, max_mb: Optional[float] = None) -> Tuple[float, int]:
+    """
+    Per-file extraction budget: the arguments, else ATS_EXTRACT_TIMEOUT
+    and ATS_EXTRACT_MAX_MB, else 10 seconds and 20 MB. 0 disables a limit.
+
+    Returns:
+        (max_seconds, max_bytes)
+    """
+    global _budget
+    if max_seconds is None:
+        max_seconds = float(os.getenv("ATS_EXTRACT_TIMEOUT", DEFAULT_TIME_BUDGET))
+    if max_mb is None:
+        max_mb = float(os.getenv("ATS_EXTRACT_MAX_MB", DEFAULT_SIZE_BUDGET))
+    _budget = (max_seconds, int(max_mb * 1024 * 1024))
+    return _budget
+
+
+def get_budget() -> Tuple[float, int]:
+    """Configured (max_seconds, max_bytes) (configure_budget() on first use)"""
+    return _budget if _budget is not None else configure_budget()
+
+
+# ======================== TIME-LIMITED EXTRACTION ========================
+
+def _extraction_loop(conn, backend):
+    """Child process: extract the pages of every (backend, cv_path) received"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        # Import the library before the first file is timed
+        importlib.import_module(BACKENDS[backend].module)
+    except ImportError:
+        pass  # reported by iter_pages
+    conn.send("ready")
+
+    extractors = {}
+    while True:
+        try:
+            backend, cv_path = conn.recv()
+        except EOFError:
+            return
+        try:
+            extractor = extractors.get(backend)
+            if extractor is None:
+                extractor = extractors[backend] = BACKENDS[backend]()
+            conn.send((True, extractor.extract_pages(cv_path)))
+        except Exception as e:
+            conn.send((False, f"{type(e).__name__}: {e}"))
+
+
+class ExtractionProcess:
+    """
+    Child process that extracts PDFs for this process, so a file stuck
+    in the PDF library (e.g. one huge or malformed page) can be stopped:
+    the child is killed when the time budget runs out and started again
+    for the next file. Starting the child (spawn and library import) is
+    not counted in the budget of a file.
+    """
+
+    START_TIMEOUT = 60.0
+
+    def __init__(self):
+        self.process = None
+        self.conn = None
+
+    def _start(self, backend: str):
+        parent_conn, child_conn = multiprocessing.Pipe()
+        context = multiprocessing.get_context("spawn")
+        process = context.Process(target=_extraction_loop, args=(child_conn, backend), daemon=True)
+        try:
+            process.start()
+        except BaseException:
+            parent_conn.close()
+            raise
+        finally:
+            child_conn.close()
+        self.process = process
+        self.conn = parent_conn
+        try:
+            ready = self.conn.poll(self.START_TIMEOUT) and self.conn.recv() == "ready"
+        except (EOFError, OSError):
+            ready = False
+        if not ready:
+            self.kill()
+            raise ExtractionProcessError("extraction process did not start")
+
+    def kill(self):
+        if self.process is not None and self.process.pid is not None:
+            self.process.kill()
+            self.process.join()
+        if self.conn is not None:
+            self.conn.close()
+        self.process = None
+        self.conn = None
+
+    def extract_pages(self, extractor: PDFExtractor, cv_path: str, max_seconds: float) -> List[str]:
+        """
+        Text of every page of cv_path, extracted in the child process.
+
+        Raises:
+            ExtractionBudgetExceeded: no result within max_seconds (the child is killed)
+            ExtractionProcessError: the child could not be started or died
+        """
+        if self.process is None or not self.process.is_alive():
+            self.kill()
+            self._start(extractor.name)
+
+        start = time.perf_counter()
+        self.conn.send((extractor.name, cv_path))
+        if not self.conn.poll(max_seconds):
+            self.kill()
+            raise ExtractionBudgetExceeded(cv_path, f"extraction over {max_seconds:g} s (stopped)",
+                                           time.perf_counter() - start)
+        try:
+            ok, result = self.conn.recv()
+        except (EOFError, OSError):
+            # The child died (crash inside the PDF library)
+            self.kill()
+            raise ExtractionProcessError(f"{cv_path}: extraction process exited")
+        if not ok:
+            raise RuntimeError(result)
+        return result
+
+
+_extraction_process: Optional[ExtractionProcess] = None
+
+
+def extract_pages_within(cv_path: str, max_seconds: float) -> List[str]:
+    """
+    Pages of cv_path with the configured extractor, stopped after
+    max_seconds (0 = no limit, extracted in this process).
+    """
+    global _extraction_process
+    extractor = get_extractor()
+    if not max_seconds:
+        return extractor.extract_pages(cv_path)
+    if _extraction_process is None:
+        _extraction_process = ExtractionProcess()
+    return _extraction_process.extract_pages(extractor, cv_path, max_seconds)
@@ -0,0 +1,374 @@
+import os
+import json
+import hashlib
+from typing import Callable, Dict, Optional, Tuple
+
+from utils.cv_document import extract_texts
+from utils import pdf_backends
+from utils.extract_pdf_regex import _extract_cv_sections
+from utils.pdf_backends import ExtractionBudgetExceeded, ExtractionFailed, ExtractionProcessError
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "extracted_text")
+SUMMARY_SUFFIX = ".summary"  # <hash>.summary.txt: line-preserving text for the summary page
+
+
+class TextCache:
+    """
+    On-disk cache of the normalized text of each CV.
+
+    Entries are keyed by the absolute path of the PDF together with its size,
+    mtime and a SHA-1 of its content, so a changed file is re-extracted
+    automatically while an untouched file is served without opening PyPDF2.
+    One extraction stores both views of a CV: the matching text and the
+    line-preserving summary text (<hash>.summary.txt), so the summary page
+    does not parse the PDF again.
+    Texts are stored per PDF backend (texts/<backend>/), so switching
+    ATS_PDF_BACKEND never serves text produced by another backend. Texts
+    cached directly under texts/ by older versions (always PyPDF2) are
+    moved into texts/pypdf2/ the first time a cache is opened.
+
+    A PDF that goes over the extraction budget (ExtractionBudgetExceeded)
+    is quarantined (quarantine.json): it is served as empty text, without
+    being opened, until its size or mtime changes or the limit it went
+    over (ATS_EXTRACT_TIMEOUT / ATS_EXTRACT_MAX_MB) is raised.
+
+    A PDF the library fails on (ExtractionFailed) is not cached as empty
+    text: it is recorded in failures.json with the backend and library
+    version, served as empty text until the file, the backend or the
+    library version changes, and extracted again then.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 extractor: Callable[[str], Tuple[str, str]] = extract_texts, backend: Optional[str] = None):
+        self.cache_dir = cache_dir
+        self.backend = backend or pdf_backends.backend_name()
+        self.text_dir = os.path.join(cache_dir, "texts", self.backend)
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.quarantine_path = os.path.join(cache_dir, "quarantine.json")
+        self.failures_path = os.path.join(cache_dir, "failures.json")
+        self.extractor = extractor
+        self._migrate_legacy_texts()
+
+        self.index = self._load_index()
+        self.quarantine = self._load_json(self.quarantine_path, "Quarantine list")
+        self.failures = self._load_json(self.failures_path, "Failure list")
+        self.hits = 0
+        self.misses = 0
+        self.skipped = {}           # quarantined path skipped -> extraction seconds not spent
+        self.newly_quarantined = 0
+        self._updates = {}
+        self._quarantine_updates = {}
+        self._failure_updates = {}
+
+    # ======================== INDEX ========================
+
+    @staticmethod
+    def _load_json(path: str, label: str) -> Dict[str, dict]:
+        if not os.path.exists(path):
+            return {}
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"{label} unreadable, starting empty: {e}")
+            return {}
+
+    def _load_index(self) -> Dict[str, dict]:
+        """Load path -> identity index from disk, or start empty"""
+        return self._load_json(self.index_path, "Text cache index")
+
+    def _merge_json(self, path: str, label: str, updates: Dict[str, dict], current: Dict[str, dict]):
+        """Re-read path, apply updates, write it back (atomic replace) and refresh current"""
+        data = self._load_json(path, label)
+        data.update(updates)
+        current.update(data)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def flush(self):
+        """
+        Write new entries to the index (and quarantine / failure lists) on disk
+        (atomic replace). The on-disk files are re-read first so entries
+        flushed by other processes sharing the cache directory are kept.
+        """
+        if self._updates:
+            self._merge_json(self.index_path, "Text cache index", self._updates, self.index)
+            self._updates = {}
+        if self._quarantine_updates:
+            self._merge_json(self.quarantine_path, "Quarantine list", self._quarantine_updates, self.quarantine)
+            self._quarantine_updates = {}
+        if self._failure_updates:
+            self._merge_json(self.failures_path, "Failure list", self._failure_updates, self.failures)
+            self._failure_updates = {}
+
+    def _migrate_legacy_texts(self):
+        """Move texts/<hash>.txt (cache layout before per-backend directories) to texts/pypdf2/"""
+        texts_root = os.path.join(self.cache_dir, "texts")
+        try:
+            legacy = [entry.name for entry in os.scandir(texts_root)
+                      if entry.is_file() and entry.name.endswith(".txt")]
+        except OSError:
+            return
+        if not legacy:
+            return
+
+        target_dir = os.path.join(texts_root, pdf_backends.DEFAULT_BACKEND)
+        os.makedirs(target_dir, exist_ok=True)
+        moved = 0
+        for name in legacy:
+            source = os.path.join(texts_root, name)
+            try:
+                if os.path.exists(os.path.join(target_dir, name)):
+                    os.remove(source)
+                else:
+                    os.replace(source, os.path.join(target_dir, name))
+                    moved += 1
+            except OSError:
+                # Already moved by another process sharing the cache
+                continue
+        print(f"Text cache: moved {moved} texts to {target_dir} ({len(legacy) - moved} duplicates removed)")
+
+    # ======================== HELPERS ========================
+
+    @staticmethod
+    def file_hash(path: str) -> str:
+        """SHA-1 of the file content"""
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 16), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _text_path(self, content_hash: str, suffix: str = "") -> str:
+        return os.path.join(self.text_dir, content_hash + suffix + ".txt")
+
+    def _read_text(self, content_hash: str, suffix: str = "") -> Optional[str]:
+        try:
+            with open(self._text_path(content_hash, suffix), "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_text(self, content_hash: str, text: str, suffix: str = ""):
+        os.makedirs(self.text_dir, exist_ok=True)
+        path = self._text_path(content_hash, suffix)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    # ======================== LOOKUP ========================
+
+    def get(self, cv_path: str) -> str:
+        """
+        Return the normalized text of cv_path, extracting it only if the
+        file is new or has changed since it was cached.
+
+        Args:
+            cv_path (str): Path to the PDF file
+
+        Returns:
+            str: Normalized text (same as extract_pdf_for_string_matching)
+        """
+        return self._get(cv_path, "")
+
+    def get_summary(self, cv_path: str) -> str:
+        """
+        Return the line-preserving text of cv_path (same as
+        extract_pdf_for_summary), stored by the same extraction as get().
+        Texts cached before summaries were stored are extracted once more.
+        """
+        return self._get(cv_path, SUMMARY_SUFFIX)
+
+    def get_sections(self, cv_path: str) -> Optional[Dict[str, str]]:
+        """CV sections of cv_path (same as extract_pdf_to_regex_string), None if the PDF has no text"""
+        text = self.get_summary(cv_path)
+        return _extract_cv_sections(text) if text else None
+
+    def _get(self, cv_path: str, suffix: str) -> str:
+        """get() / get_summary(): the text stored under suffix"""
+        try:
+            stat = os.stat(cv_path)
+        except OSError:
+            # Missing file, let the extractor report it
+            self.misses += 1
+            try:
+                return self.extractor(cv_path)[1 if suffix else 0]
+            except (ExtractionFailed, ExtractionProcessError):
+                return ""
+
+        key = os.path.abspath(cv_path)
+
+        # Quarantined and unchanged: do not open it again
+        if self.is_quarantined(cv_path, stat):
+            self.skipped[key] = self.quarantine[key]["seconds"]
+            return ""
+        # Failed before with this backend and library version: same result
+        if self.is_failed(cv_path, stat):
+            return ""
+
+        entry = self.index.get(key)
+
+        # Fast path: same size and mtime -> trust the stored hash
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            text = self._read_text(entry["hash"], suffix)
+            if text is not None:
+                self.hits += 1
+                return text
+
+        # Size/mtime changed (or text missing): compare content hash
+        content_hash = self.file_hash(cv_path)
+        text = self._read_text(content_hash, suffix)
+        if text is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            try:
+                match_text, summary_text = self.extractor(cv_path)
+            except ExtractionBudgetExceeded as e:
+                print(f"Quarantined {cv_path}: {e.reason}")
+                self.newly_quarantined += 1
+                max_seconds, max_bytes = pdf_backends.get_budget()
+                quarantined = {
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "backend": self.backend,
+                    "reason": e.reason,
+                    "seconds": e.seconds,
+                    "limit": e.limit,
+                    "max_seconds": max_seconds,
+                    "max_bytes": max_bytes,
+                }
+                self.quarantine[key] = quarantined
+                self._quarantine_updates[key] = quarantined
+                return ""
+            except ExtractionFailed as e:
+                failure = {
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "backend": self.backend,
+                    "version": pdf_backends.library_version(self.backend),
+                    "reason": e.reason,
+                }
+                self.failures[key] = failure
+                self._failure_updates[key] = failure
+                return ""
+            except ExtractionProcessError as e:
+                # Nothing stored, the file is extracted again on next use
+                print(f"Extraction failed, not cached: {e}")
+                return ""
+            self._write_text(content_hash, match_text)
+            self._write_text(content_hash, summary_text, SUMMARY_SUFFIX)
+            text = summary_text if suffix else match_text
+
+        entry = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": content_hash,
+        }
+        self.record(key, entry)
+        return text
+
+    def is_cached(self, cv_path: str) -> bool:
+        """True if cv_path is unchanged since it was cached (size, mtime) and both its texts are on disk"""
+        try:
+            stat = os.stat(cv_path)
+        except OSError:
+            return False
+
+        entry = self.index.get(os.path.abspath(cv_path))
+        return (entry is not None and entry["size"] == stat.st_size
+                and entry["mtime_ns"] == stat.st_mtime_ns
+                and os.path.exists(self._text_path(entry["hash"]))
+                and os.path.exists(self._text_path(entry["hash"], SUMMARY_SUFFIX)))
+
+    def is_quarantined(self, cv_path: str, stat=None) -> bool:
+        """
+        True if cv_path went over the extraction budget (this backend), has
+        not changed since and the limit it went over has not been raised
+        """
+        entry = self.quarantine.get(os.path.abspath(cv_path))
+        if entry is None or entry.get("backend") != self.backend or self._budget_raised(entry):
+            return False
+        if stat is None:
+            try:
+                stat = os.stat(cv_path)
+            except OSError:
+                return False
+        return entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns
+
+    def is_failed(self, cv_path: str, stat=None) -> bool:
+        """True if extracting cv_path failed with this backend and library version and it has not changed since"""
+        entry = self.failures.get(os.path.abspath(cv_path))
+        if (entry is None or entry["backend"] != self.backend
+                or entry["version"] != pdf_backends.library_version(self.backend)):
+            return False
+        if stat is None:
+            try:
+                stat = os.stat(cv_path)
+            except OSError:
+                return False
+        return entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns
+
+    @staticmethod
+    def _budget_raised(entry: dict) -> bool:
+        """The limit entry went over is now higher (0 = no limit); entries without a recorded budget are retried"""
+        max_seconds, max_bytes = pdf_backends.get_budget()
+        if entry.get("limit") == "size":
+            budget, recorded = max_bytes, entry.get("max_bytes")
+        else:
+            budget, recorded = max_seconds, entry.get("max_seconds")
+        return recorded is None or not budget or budget > recorded
+
+    def entry(self, cv_path: str) -> Optional[dict]:
+        """Index entry of cv_path, None if it was never cached"""
+        return self.index.get(os.path.abspath(cv_path))
+
+    def record(self, key: str, entry: dict):
+        """Add an index entry (e.g. one reported by a worker process); written by flush()"""
+        self.index[key] = entry
+        self._updates[key] = entry
+
+    # ======================== STATS ========================
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.skipped = {}
+        self.newly_quarantined = 0
+
+    def merge_stats(self, stats: dict):
+        """Add counters reported by another cache (e.g. a worker process)"""
+        self.hits += stats.get("hits", 0)
+        self.misses += stats.get("misses", 0)
+        self.skipped.update(stats.get("quarantined_files", {}))
+        self.newly_quarantined += stats.get("newly_quarantined", 0)
+        if stats.get("newly_quarantined"):
+            # Entries were flushed by the worker
+            self.quarantine.update(self._load_json(self.quarantine_path, "Quarantine list"))
+
+    def stats(self) -> dict:
+        """Counters since the last reset_stats()"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "quarantined": len(self.skipped),
+            "time_saved": sum(self.skipped.values()),
+            "quarantined_files": dict(self.skipped),
+            "newly_quarantined": self.newly_quarantined,
+        }
+
+    def print_stats(self):
+        s = self.stats()
+        print(f"Text cache: {s['hits']} hits, {s['misses']} misses "
+              f"({s['hit_rate'] * 100:.1f}% hit rate)")
+        if s['quarantined'] or s['newly_quarantined']:
+            print(f"Quarantine: {s['quarantined']} CVs skipped (~{s['time_saved']:.1f} s of extraction saved), "
+                  f"{s['newly_quarantined']} newly quarantined")
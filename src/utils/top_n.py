@@ -0,0 +1,51 @@
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+
+class TopN:
+    """
+    Bounded min-heap of the `limit` best (index, result) pairs.
+
+    Order is match_count descending, ties by dataset index ascending (the
+    order of a stable sort over the sequential scan). The heap root is the
+    worst kept result, so memory stays at `limit` entries however many CVs
+    match.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = max(0, limit)
+        self.count = 0      # number of results offered with push()
+        self._heap = []     # (match_count, -index, result)
+
+    def push(self, idx: int, result: Dict) -> bool:
+        """Offer a result, returns True if it is kept"""
+        self.count += 1
+        if self.limit == 0:
+            return False
+
+        item = (result['match_count'], -idx, result)
+        if len(self._heap) < self.limit:
+            heapq.heappush(self._heap, item)
+            return True
+        if item[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, item)
+            return True
+        return False
+
+    def extend(self, indexed_results: List[Tuple[int, Dict]]):
+        for idx, result in indexed_results:
+            self.push(idx, result)
+
+    def is_full(self) -> bool:
+        return len(self._heap) >= self.limit
+
+    def worst_count(self) -> Optional[int]:
+        """match_count of the worst kept result (None while not full)"""
+        if not self.is_full() or not self._heap:
+            return None
+        return self._heap[0][0]
+
+    def ranked(self) -> List[Tuple[int, Dict]]:
+        """Kept (index, result) pairs, best first"""
+        return [(-neg_idx, result) for count, neg_idx, result in
+                sorted(self._heap, key=lambda item: (-item[0], -item[1]))]